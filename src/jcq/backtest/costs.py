@@ -31,7 +31,7 @@ def calculate_costs(
     slippage_ticks = cfg_risk.get("costs", {}).get("slippage_ticks_per_side", 0.5)
     fees_per_contract = cfg_risk.get("costs", {}).get("fees_per_contract", 0.50)
     
-    slippage_cost = slippage_ticks * spec["tick_value"] * qty
+    slippage_cost = slippage_ticks * spec.tick_value * qty
     fees = fees_per_contract * qty
     
     return slippage_cost + fees
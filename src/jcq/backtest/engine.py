@@ -6,7 +6,7 @@ from typing import Dict, Any, List, Optional
 import logging
 from datetime import date
 
-from jcq.features.features import build_features
+from jcq.features.features import build_features, add_rule_columns
 from jcq.strategy.candidates import generate_candidates
 from jcq.strategy.scorer import score_candidates, rank_candidates
 from jcq.strategy.rules import apply_rules
@@ -36,7 +36,13 @@ class BacktestEngine:
             cfg_strategy: Strategy configuration
             cfg_market: Market configuration
             cfg_risk: Risk configuration
+        
+        Raises:
+            ValueError: If the model has not been fitted
         """
+        if not getattr(model, "is_fitted", False):
+            raise ValueError("Model must be fitted before running a backtest")
+        
         self.model = model
         self.cfg_strategy = cfg_strategy
         self.cfg_market = cfg_market
@@ -70,6 +76,15 @@ class BacktestEngine:
         if df_features.empty:
             return {"trades": pd.DataFrame(), "metrics": {}}
         
+        add_rule_columns(df_features)
+        
+        # Fail fast on a feature/model mismatch instead of inside the bar loop
+        feature_order = getattr(self.model, "feature_names_in_", None)
+        if feature_order is not None:
+            missing = [c for c in feature_order if c not in df_features.columns]
+            if missing:
+                raise ValueError(f"Features are missing columns the model was fitted on: {missing}")
+        
         # Iterate through bars
         for i in range(100, len(df_features)):  # Start after feature window
             current_bar = df_features.iloc[i]
@@ -149,7 +164,7 @@ class BacktestEngine:
             
             from jcq.risk.contract_specs import get_contract_spec
             spec = get_contract_spec(symbol)
-            pnl_dollars = pnl_points * spec["point_value"] * qty
+            pnl_dollars = pnl_points * spec.point_value * qty
             
             # Costs
             entry_costs = calculate_costs(symbol, qty, self.cfg_risk, entry=True)
@@ -160,7 +175,7 @@ class BacktestEngine:
             
             # R multiple
             risk_points = candidate["risk_points"]
-            r_mult = net_pnl / (risk_points * spec["point_value"] * qty) if risk_points > 0 else 0
+            r_mult = net_pnl / (risk_points * spec.point_value * qty) if risk_points > 0 else 0
             
             # Record trade
             exit_ts = df_bars.index[execution["exit_bar_idx"]] if execution["exit_bar_idx"] < len(df_bars.index) else current_ts
@@ -1,6 +1,7 @@
 """Configuration loading and management."""
 
 import os
+import sys
 import yaml
 from pathlib import Path
 from typing import Any, Dict, Optional
@@ -97,5 +98,11 @@ def reload_config() -> Dict[str, Any]:
     global _CONFIG
     get_config.cache_clear()
     _CONFIG = load_config()
+    
+    # Drop config-derived caches in modules that are already loaded
+    parquet_store = sys.modules.get("jcq.storage.parquet_store")
+    if parquet_store is not None:
+        parquet_store._get_data_dir.cache_clear()
+    
     return _CONFIG
 
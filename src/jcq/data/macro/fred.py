@@ -11,6 +11,13 @@ from sqlalchemy import text
 
 logger = logging.getLogger(__name__)
 
+# Built once and reused for every series
+_MACRO_UPSERT = text("""
+    INSERT INTO macro_series (date, series, value)
+    VALUES (:date, :series, :value)
+    ON CONFLICT (date, series) DO UPDATE SET value = EXCLUDED.value
+""")
+
 
 def fetch_fred_series(series_id: str, api_key: str) -> pd.DataFrame:
     """
@@ -63,15 +70,13 @@ def fetch_fred_series(series_id: str, api_key: str) -> pd.DataFrame:
         try:
             engine = get_engine()
             with engine.begin() as conn:
-                for date, row in df.iterrows():
-                    conn.execute(
-                        text("""
-                            INSERT INTO macro_series (date, series, value)
-                            VALUES (:date, :series, :value)
-                            ON CONFLICT (date, series) DO UPDATE SET value = EXCLUDED.value
-                        """),
-                        {"date": date, "series": series_id, "value": float(row["value"])},
-                    )
+                conn.execute(
+                    _MACRO_UPSERT,
+                    [
+                        {"date": date, "series": series_id, "value": value}
+                        for date, value in zip(df.index, df["value"].tolist())
+                    ],
+                )
         except Exception as e:
             logger.warning(f"Failed to store in database: {e}")
         
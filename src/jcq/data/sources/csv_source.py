@@ -69,10 +69,12 @@ class CsvReplaySource(BarsSource):
         
         df = self._data[cache_key]
         
-        # Filter by time range
+        # Filter by time range (cached frame is sorted, so binary-search the bounds)
         if "timestamp" in df.columns:
-            mask = (df["timestamp"] >= start) & (df["timestamp"] <= end)
-            df = df[mask].copy()
+            ts = df["timestamp"]
+            lo = ts.searchsorted(start, side="left")
+            hi = ts.searchsorted(end, side="right")
+            df = df.iloc[lo:hi].copy()
         
         return df
     
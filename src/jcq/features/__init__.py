@@ -1,11 +1,13 @@
 """Feature engineering for market data."""
 
-from jcq.features.features import build_features
+from jcq.features.features import build_features, add_rule_columns, RULE_ONLY_COLUMNS
 from jcq.features.sessions import to_utc, session_day, is_rth, minutes_since_rth_open
 from jcq.features.regime import compute_regime
 
 __all__ = [
     "build_features",
+    "add_rule_columns",
+    "RULE_ONLY_COLUMNS",
     "to_utc",
     "session_day",
     "is_rth",
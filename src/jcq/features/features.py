@@ -11,6 +11,28 @@ from jcq.features.sessions import is_rth, minutes_since_rth_open, label_session,
 logger = logging.getLogger(__name__)
 
 
+# Columns added for rule gates only; they are never model inputs
+RULE_ONLY_COLUMNS = ("atr_14_med100",)
+
+
+def add_rule_columns(df_features: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add the columns read by the rule gates to a built feature frame, in place.
+    
+    Computed on the post-dropna frame returned by build_features, so the
+    100-bar ATR median matches a median over the trailing feature rows.
+    
+    Args:
+        df_features: DataFrame returned by build_features
+    
+    Returns:
+        The same DataFrame with RULE_ONLY_COLUMNS added
+    """
+    if "atr_14" in df_features.columns:
+        df_features["atr_14_med100"] = df_features["atr_14"].rolling(100, min_periods=10).median()
+    return df_features
+
+
 def build_features(df_bars: pd.DataFrame, cfg_market: Dict[str, Any]) -> pd.DataFrame:
     """
     Build institutional-grade features from bars.
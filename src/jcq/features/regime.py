@@ -34,7 +34,10 @@ def compute_regime(df_features: pd.DataFrame, cfg_strategy: Dict[str, Any]) -> p
         vol_regime[atr > atr_percentiles[0.67]] = "high_vol"
     else:
         # Fallback
-        atr_median = atr.rolling(100, min_periods=10).median()
+        if "atr_14_med100" in df_features.columns:
+            atr_median = df_features["atr_14_med100"]
+        else:
+            atr_median = atr.rolling(100, min_periods=10).median()
         vol_regime[atr < atr_median * 0.7] = "low_vol"
         vol_regime[atr > atr_median * 1.3] = "high_vol"
     
@@ -3,17 +3,20 @@
 import time
 import signal
 import sys
+import queue
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Dict
+import numpy as np
 import pandas as pd
 import logging
 
 from jcq.core.config import get_config, reload_config
 from jcq.core.logging import setup_logging, get_logger
 from jcq.data.sources.demo import DemoBarsSource
-from jcq.features.features import build_features
+from jcq.features.features import build_features, add_rule_columns
 from jcq.strategy.candidates import generate_candidates
-from jcq.strategy.scorer import score_candidates, rank_candidates
+from jcq.strategy.scorer import score_candidates_fast, rank_candidates, model_feature_index
 from jcq.strategy.rules import apply_rules
 from jcq.risk.risk_manager import RiskManager
 from jcq.models.prob_model import ProbModel
@@ -21,11 +24,36 @@ from jcq.live.paper_broker import PaperBroker
 from jcq.live.state import LiveState
 from jcq.storage.db import get_engine, ensure_schema
 from jcq.storage.schema import ModelOutput
-from sqlalchemy import text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import OperationalError
 
 logger = get_logger(__name__)
 
 
+def _build_model_output_upsert(insert):
+    """Build the model_outputs upsert for a dialect-specific insert()."""
+    stmt = insert(ModelOutput.__table__)
+    return stmt.on_conflict_do_update(
+        index_elements=["ts", "symbol", "timeframe"],
+        set_=dict(
+            prob_up=stmt.excluded.prob_up,
+            prob_down=stmt.excluded.prob_down,
+            expected_r=stmt.excluded.expected_r,
+            ev_r=stmt.excluded.ev_r,
+            meta=stmt.excluded.meta,
+        ),
+    )
+
+
+# Built once so SQLAlchemy's compiled cache (and the server-side prepared
+# plan on Postgres) is reused for every bar instead of re-parsing SQL text.
+_MODEL_OUTPUT_STMTS = {
+    "postgresql": _build_model_output_upsert(postgresql.insert),
+    "sqlite": _build_model_output_upsert(sqlite.insert),
+}
+
+
 class LiveLoop:
     """Live trading loop."""
     
@@ -44,7 +72,13 @@ class LiveLoop:
             model: Fitted ProbModel
             symbol: Symbol to trade
             timeframe: Bar timeframe
+        
+        Raises:
+            ValueError: If the model has not been fitted
         """
+        if not getattr(model, "is_fitted", False):
+            raise ValueError("Model must be fitted before starting the live loop")
+        
         self.source = source
         self.model = model
         self.symbol = symbol
@@ -54,11 +88,24 @@ class LiveLoop:
         self.cfg_market = self.config.get("market", {})
         self.cfg_risk = self.config.get("risk", {})
         self.risk_manager = RiskManager(self.cfg_risk)
-        self.state = LiveState()
+        
+        # Heartbeat/state file writes run on a background thread so the
+        # per-bar path never blocks on disk I/O
+        self._io_q: queue.Queue = queue.Queue(maxsize=1)
+        self._io_thread = threading.Thread(target=self._io_worker, name="live-io", daemon=True)
+        self._io_thread.start()
+        
+        self.state = LiveState(writer=self._io_q.put)
         self.broker: Optional[PaperBroker] = None
         self.running = False
         self.df_bars = pd.DataFrame()
         self.df_features = pd.DataFrame()
+        self._feat_buf: np.ndarray = np.empty((0, 0))
+        self._feat_arr: np.ndarray = self._feat_buf
+        self._feat_cols: Dict[str, int] = {}
+        self._feat_idx: np.ndarray = np.empty(0, dtype=np.intp)
+        self._feat_last_ts: Optional[pd.Timestamp] = None
+        self._conn: Optional[Connection] = None
         
         # Setup broker if execution enabled
         exec_enabled = self.config.get("execution", {}).get("enabled", False)
@@ -76,8 +123,25 @@ class LiveLoop:
         """Handle shutdown signals."""
         logger.info("Received shutdown signal, stopping...")
         self.running = False
+        self._close_conn()
+        self._io_q.join()
         sys.exit(0)
     
+    def _get_conn(self) -> Connection:
+        """Get the long-lived autocommit connection, opening it if needed."""
+        if self._conn is None:
+            self._conn = get_engine().connect().execution_options(isolation_level="AUTOCOMMIT")
+        return self._conn
+    
+    def _close_conn(self) -> None:
+        """Close the long-lived connection if open."""
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception as e:
+                logger.debug(f"Error closing connection: {e}")
+            self._conn = None
+    
     def _check_kill_switch(self) -> bool:
         """Check for kill switch file."""
         kill_file = Path("data/logs/KILL")
@@ -86,12 +150,76 @@ class LiveLoop:
             return True
         return False
     
-    def _update_heartbeat(self) -> None:
-        """Update heartbeat file."""
+    def _io_worker(self) -> None:
+        """Run queued file-write jobs."""
+        while True:
+            job = self._io_q.get()
+            try:
+                job()
+            except Exception as e:
+                logger.warning(f"Background write failed: {e}")
+            finally:
+                self._io_q.task_done()
+    
+    def _write_heartbeat(self, ts: pd.Timestamp) -> None:
+        """Write heartbeat file."""
         heartbeat_file = Path("data/logs/heartbeat.txt")
         heartbeat_file.parent.mkdir(parents=True, exist_ok=True)
         with open(heartbeat_file, "w") as f:
-            f.write(f"{pd.Timestamp.now(tz='UTC').isoformat()}\n")
+            f.write(f"{ts.isoformat()}\n")
+    
+    def _update_heartbeat(self) -> None:
+        """Queue a heartbeat write (skipped if a write is already pending)."""
+        ts = pd.Timestamp.now(tz="UTC")
+        try:
+            self._io_q.put_nowait(lambda: self._write_heartbeat(ts))
+        except queue.Full:
+            pass
+    
+    def _sync_feature_array(self) -> None:
+        """
+        Keep the NumPy mirror of df_features in step, appending new rows only.
+        
+        Rows live in a preallocated buffer whose capacity doubles when full, so
+        appending a bar copies only the new rows; _feat_arr is a view of the
+        filled part. The mirror is rebuilt when the columns change or the rows
+        it holds no longer end at the bar it last saw (e.g. a trimmed window).
+        """
+        cols = {c: i for i, c in enumerate(self.df_features.columns)}
+        n_have = len(self._feat_arr)
+        n_want = len(self.df_features)
+        index = self.df_features.index
+        
+        if (
+            cols != self._feat_cols
+            or n_want < n_have
+            or (n_have and index[n_have - 1] != self._feat_last_ts)
+        ):
+            arr = self.df_features.to_numpy()
+            self._feat_buf = np.empty((max(2 * n_want, 1), arr.shape[1]), dtype=arr.dtype)
+            self._feat_buf[:n_want] = arr
+            self._feat_arr = self._feat_buf[:n_want]
+            self._feat_cols = cols
+            self._feat_idx = model_feature_index(cols, self.model)
+        elif n_want > n_have:
+            new_rows = self.df_features.iloc[n_have:].to_numpy()
+            dtype = np.result_type(self._feat_buf.dtype, new_rows.dtype)
+            if n_want > len(self._feat_buf) or dtype != self._feat_buf.dtype:
+                buf = np.empty((max(2 * n_want, 1), self._feat_buf.shape[1]), dtype=dtype)
+                buf[:n_have] = self._feat_arr
+                self._feat_buf = buf
+            self._feat_buf[n_have:n_want] = new_rows
+            self._feat_arr = self._feat_buf[:n_want]
+        
+        self._feat_last_ts = index[-1] if n_want else None
+    
+    def _check_model_features(self) -> None:
+        """Fail fast if df_features lacks a column the model was fitted on."""
+        feature_order = getattr(self.model, "feature_names_in_", None)
+        if feature_order is not None:
+            missing = [c for c in feature_order if c not in self.df_features.columns]
+            if missing:
+                raise ValueError(f"Features are missing columns the model was fitted on: {missing}")
     
     def run(self) -> None:
         """Run the live loop."""
@@ -109,7 +237,9 @@ class LiveLoop:
                 return
             
             # Build features
-            self.df_features = build_features(self.df_bars, self.cfg_market)
+            self.df_features = add_rule_columns(build_features(self.df_bars, self.cfg_market))
+            self._check_model_features()
+            self._sync_feature_array()
             
             logger.info(f"Loaded {len(self.df_bars)} bars and {len(self.df_features)} feature rows")
         except Exception as e:
@@ -127,8 +257,12 @@ class LiveLoop:
                 # In production, would use source.stream_live()
                 
                 # Process latest bar
+                # A scoring failure must not skip the heartbeat below
                 if len(self.df_bars) > 0:
-                    self._process_bar()
+                    try:
+                        self._process_bar()
+                    except Exception as e:
+                        logger.error(f"Failed to process bar: {e}", exc_info=True)
                 
                 # Update heartbeat
                 self._update_heartbeat()
@@ -143,6 +277,8 @@ class LiveLoop:
                 logger.error(f"Error in live loop: {e}", exc_info=True)
                 time.sleep(10)  # Wait before retry
         
+        self._close_conn()
+        self._io_q.join()
         logger.info("Live loop stopped")
     
     def _process_bar(self) -> None:
@@ -150,7 +286,8 @@ class LiveLoop:
         if self.df_features.empty:
             return
         
-        latest_features = self.df_features.iloc[-1:]
+        self._sync_feature_array()
+        row = self._feat_arr[-1]
         current_ts = self.df_features.index[-1]
         
         # Generate candidates
@@ -160,7 +297,10 @@ class LiveLoop:
             return
         
         # Score
-        scored = score_candidates(candidates, self.df_features, self.model, self.cfg_strategy)
+        scored = score_candidates_fast(
+            candidates, row, self._feat_cols, self.model, self.cfg_strategy,
+            feature_idx=self._feat_idx,
+        )
         
         if not scored:
             return
@@ -206,31 +346,24 @@ class LiveLoop:
     def _log_model_output(self, ts: pd.Timestamp, candidate: Dict) -> None:
         """Log model output to database."""
         try:
-            engine = get_engine()
-            with engine.begin() as conn:
-                conn.execute(
-                    text("""
-                        INSERT INTO model_outputs 
-                        (ts, symbol, timeframe, prob_up, prob_down, expected_r, ev_r, meta)
-                        VALUES (:ts, :symbol, :timeframe, :prob_up, :prob_down, :expected_r, :ev_r, :meta)
-                        ON CONFLICT (ts, symbol, timeframe) DO UPDATE SET
-                            prob_up = EXCLUDED.prob_up,
-                            prob_down = EXCLUDED.prob_down,
-                            expected_r = EXCLUDED.expected_r,
-                            ev_r = EXCLUDED.ev_r,
-                            meta = EXCLUDED.meta
-                    """),
-                    {
-                        "ts": ts,
-                        "symbol": self.symbol,
-                        "timeframe": self.timeframe,
-                        "prob_up": candidate.get("prob_up", 0.5),
-                        "prob_down": candidate.get("prob_down", 0.5),
-                        "expected_r": candidate.get("expected_r", 0.0),
-                        "ev_r": candidate.get("ev_r", 0.0),
-                        "meta": candidate.get("context", {}),
-                    },
-                )
+            conn = self._get_conn()
+            conn.execute(
+                _MODEL_OUTPUT_STMTS[conn.dialect.name],
+                {
+                    "ts": ts,
+                    "symbol": self.symbol,
+                    "timeframe": self.timeframe,
+                    "prob_up": candidate.get("prob_up", 0.5),
+                    "prob_down": candidate.get("prob_down", 0.5),
+                    "expected_r": candidate.get("expected_r", 0.0),
+                    "ev_r": candidate.get("ev_r", 0.0),
+                    "meta": candidate.get("context", {}),
+                },
+            )
+        except OperationalError as e:
+            # Drop the broken connection; the next bar reopens it lazily
+            logger.warning(f"Lost database connection while logging model output: {e}")
+            self._close_conn()
         except Exception as e:
             logger.warning(f"Failed to log model output: {e}")
 
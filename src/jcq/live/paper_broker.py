@@ -1,5 +1,6 @@
 """Paper trading broker (simulated execution)."""
 
+import numpy as np
 import pandas as pd
 from typing import Dict, Any, List, Optional
 import logging
@@ -130,51 +131,42 @@ class PaperBroker(Broker):
         """
         closed_trades = []
         
-        for pos_id, position in list(self.positions.items()):
-            side = position["side"]
-            stop = position["stop_price"]
-            target = position["target_price"]
+        if not self.positions:
+            return closed_trades
+        
+        pos_ids = list(self.positions)
+        positions = [self.positions[pos_id] for pos_id in pos_ids]
+        sides_long = np.array([p["side"] == "long" for p in positions])
+        stops = np.array([p["stop_price"] for p in positions], dtype=np.float64)
+        targets = np.array([p["target_price"] for p in positions], dtype=np.float64)
+        high = current_bar["high"]
+        low = current_bar["low"]
+        
+        # Stop takes precedence over target when both are touched in the same bar
+        stop_hit = np.where(sides_long, low <= stops, high >= stops)
+        target_hit = np.where(sides_long, high >= targets, low <= targets) & ~stop_hit
+        exit_px = np.where(stop_hit, stops, targets)
+        
+        for i in np.flatnonzero(stop_hit | target_hit):
+            pos_id = pos_ids[i]
+            position = positions[i]
+            exit_price = float(exit_px[i])
+            exit_reason = "stop" if stop_hit[i] else "target"
             
-            # Check stop
-            stop_hit = False
-            if side == "long" and current_bar["low"] <= stop:
-                exit_price = stop
-                exit_reason = "stop"
-                stop_hit = True
-            elif side == "short" and current_bar["high"] >= stop:
-                exit_price = stop
-                exit_reason = "stop"
-                stop_hit = True
+            trade = {
+                "symbol": position["symbol"],
+                "side": position["side"],
+                "qty": position["qty"],
+                "entry_price": position["entry_price"],
+                "exit_price": exit_price,
+                "stop_price": position["stop_price"],
+                "target_price": position["target_price"],
+                "exit_reason": exit_reason,
+            }
             
-            # Check target
-            target_hit = False
-            if not stop_hit:
-                if side == "long" and current_bar["high"] >= target:
-                    exit_price = target
-                    exit_reason = "target"
-                    target_hit = True
-                elif side == "short" and current_bar["low"] <= target:
-                    exit_price = target
-                    exit_reason = "target"
-                    target_hit = True
+            closed_trades.append(trade)
+            del self.positions[pos_id]
             
-            if stop_hit or target_hit:
-                # Close position
-                trade = {
-                    "symbol": position["symbol"],
-                    "side": side,
-                    "qty": position["qty"],
-                    "entry_price": position["entry_price"],
-                    "exit_price": exit_price,
-                    "stop_price": stop,
-                    "target_price": target,
-                    "exit_reason": exit_reason,
-                }
-                
-                closed_trades.append(trade)
-                del self.positions[pos_id]
-                
-                logger.info(f"Closed position {pos_id}: {exit_reason} @ {exit_price}")
+            logger.info(f"Closed position {pos_id}: {exit_reason} @ {exit_price}")
         
         return closed_trades
-
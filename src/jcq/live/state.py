@@ -1,6 +1,6 @@
 """Live loop state management."""
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable
 import pandas as pd
 import json
 from pathlib import Path
@@ -12,14 +12,21 @@ logger = logging.getLogger(__name__)
 class LiveState:
     """State manager for live loop."""
     
-    def __init__(self, state_file: str = "data/logs/live_state.json"):
+    def __init__(
+        self,
+        state_file: str = "data/logs/live_state.json",
+        writer: Optional[Callable[[Callable[[], None]], None]] = None,
+    ):
         """
         Initialize state manager.
         
         Args:
             state_file: Path to state file
+            writer: Optional callable that runs write jobs (e.g. on a background
+                thread); if None, saves are written synchronously
         """
         self.state_file = Path(state_file)
+        self.writer = writer
         self.state_file.parent.mkdir(parents=True, exist_ok=True)
         self.state: Dict[str, Any] = {}
         self.load()
@@ -39,9 +46,22 @@ class LiveState:
     
     def save(self) -> None:
         """Save state to file."""
+        try:
+            payload = json.dumps(self.state, indent=2, default=str)
+        except Exception as e:
+            logger.error(f"Failed to save state: {e}")
+            return
+        
+        if self.writer is not None:
+            self.writer(lambda: self._write(payload))
+        else:
+            self._write(payload)
+    
+    def _write(self, payload: str) -> None:
+        """Write serialized state to file."""
         try:
             with open(self.state_file, "w") as f:
-                json.dump(self.state, f, indent=2, default=str)
+                f.write(payload)
             logger.debug(f"Saved state to {self.state_file}")
         except Exception as e:
             logger.error(f"Failed to save state: {e}")
@@ -21,8 +21,33 @@ class BayesianAdjustment:
         """
         self.window = window
         self.shrinkage_factor = shrinkage_factor
-        self.recent_probs = []
-        self.recent_outcomes = []
+        
+        # Fixed-size buffers (oldest first) plus scratch space for the Brier kernel
+        self._probs = np.empty(window)
+        self._outs = np.empty(window)
+        self._buf = np.empty(window)
+        self._n_probs = 0
+        self._n = 0
+    
+    @property
+    def recent_probs(self) -> list[float]:
+        """Recent predicted probabilities (oldest first)."""
+        return self._probs[:self._n_probs].tolist()
+    
+    @property
+    def recent_outcomes(self) -> list[float]:
+        """Recent observed outcomes (oldest first)."""
+        return self._outs[:self._n].tolist()
+    
+    @staticmethod
+    def _push(buf: np.ndarray, n: int, value: float) -> int:
+        """Append to a fixed-size buffer, dropping the oldest value when full."""
+        if n < len(buf):
+            buf[n] = value
+            return n + 1
+        buf[:-1] = buf[1:]
+        buf[-1] = value
+        return n
     
     def update(self, prob: float, outcome: Optional[float] = None) -> None:
         """
@@ -32,15 +57,9 @@ class BayesianAdjustment:
             prob: Predicted probability
             outcome: Actual outcome (1.0 for up, 0.0 for down, None if unknown)
         """
-        self.recent_probs.append(prob)
+        self._n_probs = self._push(self._probs, self._n_probs, prob)
         if outcome is not None:
-            self.recent_outcomes.append(outcome)
-        
-        # Keep window size
-        if len(self.recent_probs) > self.window:
-            self.recent_probs.pop(0)
-        if len(self.recent_outcomes) > self.window:
-            self.recent_outcomes.pop(0)
+            self._n = self._push(self._outs, self._n, outcome)
     
     def adjust(self, prob: float) -> tuple[float, float]:
         """
@@ -52,28 +71,42 @@ class BayesianAdjustment:
         Returns:
             (adjusted_prob, confidence) tuple
         """
-        if len(self.recent_outcomes) < 10:
+        adjusted, confidence = self.adjust_array(np.asarray(prob, dtype=float))
+        if self._n < 10:
+            return prob, confidence
+        return float(adjusted), confidence
+    
+    def adjust_array(self, probs: np.ndarray) -> tuple[np.ndarray, float]:
+        """
+        Adjust an array of probabilities with a single calibration pass.
+        
+        Args:
+            probs: Raw probabilities
+        
+        Returns:
+            (adjusted_probs, confidence) tuple; confidence is shared by all entries
+        """
+        n = self._n
+        if n < 10:
             # Not enough data, return as-is
-            return prob, 0.5
+            return probs, 0.5
         
         # Compute Brier score on recent predictions
-        recent_probs_window = self.recent_probs[-len(self.recent_outcomes):]
-        brier_scores = [
-            (p - o) ** 2 for p, o in zip(recent_probs_window, self.recent_outcomes)
-        ]
-        avg_brier = np.mean(brier_scores)
+        buf = self._buf[:n]
+        np.subtract(self._probs[self._n_probs - n:self._n_probs], self._outs[:n], out=buf)
+        np.square(buf, out=buf)
+        avg_brier = buf.mean()
         
         # Shrink toward 0.5 if calibration is poor (high Brier score)
         # Perfect calibration: Brier = 0.25 (for balanced classes)
         # Poor calibration: Brier > 0.3
         if avg_brier > 0.3:
             shrinkage = self.shrinkage_factor * (avg_brier - 0.25) / 0.25
-            adjusted_prob = prob * (1 - shrinkage) + 0.5 * shrinkage
+            adjusted = probs * (1 - shrinkage) + 0.5 * shrinkage
         else:
-            adjusted_prob = prob
+            adjusted = probs
         
         # Confidence based on calibration quality
         confidence = max(0.0, min(1.0, 1.0 - (avg_brier - 0.25) / 0.25))
         
-        return adjusted_prob, confidence
-
+        return adjusted, confidence
@@ -34,6 +34,7 @@ class ProbModel:
         self.model = None
         self.calibrated_model = None
         self.is_fitted = False
+        self._fast: Optional[Dict[str, Any]] = None
     
     def _create_model(self):
         """Create the underlying model."""
@@ -116,18 +117,24 @@ class ProbModel:
             cv=cfg.get("cv", 5),
         )
         self.calibrated_model.fit(X_scaled, y_clean)
+        self._build_fast_predictor()
         
         self.is_fitted = True
         logger.info(f"Fitted {self.model_type} model on {len(X_clean)} samples")
         
         return self
     
-    def predict_proba(self, X: pd.DataFrame) -> np.ndarray:
+    @property
+    def feature_names_in_(self) -> Optional[np.ndarray]:
+        """Feature columns seen at fit time, in order (None if fitted on arrays)."""
+        return getattr(self.scaler, "feature_names_in_", None)
+    
+    def predict_proba(self, X: pd.DataFrame | np.ndarray) -> np.ndarray:
         """
         Predict probabilities.
         
         Args:
-            X: Feature DataFrame
+            X: Feature DataFrame, or a 2-D array with columns in feature_names_in_ order
         
         Returns:
             Array of shape (n_samples, 2) with [prob_down, prob_up]
@@ -135,14 +142,97 @@ class ProbModel:
         if not self.is_fitted:
             raise ValueError("Model must be fitted first")
         
-        # Scale
-        X_scaled = self.scaler.transform(X)
+        if self._fast is not None:
+            return self._fast_predict_proba(X)
+        
+        # Scale (raw arrays skip the scaler's feature-name validation)
+        if isinstance(X, np.ndarray):
+            X_scaled = (X - self.scaler.mean_) / self.scaler.scale_
+        else:
+            X_scaled = self.scaler.transform(X)
         
         # Predict
         proba = self.calibrated_model.predict_proba(X_scaled)
         
         return proba
     
+    def _build_fast_predictor(self) -> None:
+        """
+        Collapse the calibrated CV ensemble into stacked arrays.
+        
+        For linear base models the scaler and every fold's estimator fold into a
+        single (n_features, n_folds) weight matrix, so prediction is one matmul
+        plus vectorized calibration instead of one sklearn call per fold.
+        Other model types keep using calibrated_model.predict_proba.
+        """
+        self._fast = None
+        
+        calibrated = getattr(self.calibrated_model, "calibrated_classifiers_", None)
+        if not calibrated or len(self.calibrated_model.classes_) != 2:
+            return
+        
+        method = calibrated[0].method
+        if method not in ("sigmoid", "isotonic"):
+            return
+        
+        coefs = []
+        intercepts = []
+        for cc in calibrated:
+            coef = getattr(cc.estimator, "coef_", None)
+            if coef is None or coef.shape[0] != 1 or len(cc.calibrators) != 1:
+                return
+            coefs.append(coef[0])
+            intercepts.append(float(np.ravel(cc.estimator.intercept_)[0]))
+        
+        coefs = np.asarray(coefs, dtype=np.float64)
+        intercepts = np.asarray(intercepts, dtype=np.float64)
+        
+        # decision = ((X - mean) / scale) @ coef + b = X @ (coef / scale) + (b - mean @ (coef / scale))
+        weights = coefs / self.scaler.scale_
+        fast: Dict[str, Any] = {
+            "method": method,
+            "weights": np.ascontiguousarray(weights.T),
+            "intercepts": intercepts - weights @ self.scaler.mean_,
+        }
+        
+        if method == "sigmoid":
+            fast["a"] = np.array([cc.calibrators[0].a_ for cc in calibrated], dtype=np.float64)
+            fast["b"] = np.array([cc.calibrators[0].b_ for cc in calibrated], dtype=np.float64)
+        else:
+            fast["tables"] = [
+                (cc.calibrators[0].X_thresholds_, cc.calibrators[0].y_thresholds_)
+                for cc in calibrated
+            ]
+        
+        self._fast = fast
+    
+    def _fast_predict_proba(self, X) -> np.ndarray:
+        """Predict probabilities from the collapsed ensemble arrays."""
+        fast = self._fast
+        if isinstance(X, pd.DataFrame):
+            # Align columns by name; a positional matmul would silently mix features
+            names = self.feature_names_in_
+            if names is not None:
+                missing = [c for c in names if c not in X.columns]
+                if missing:
+                    raise ValueError(f"X is missing feature columns seen at fit time: {missing}")
+                X = X[list(names)]
+        X = np.asarray(X, dtype=np.float64)
+        if not np.isfinite(X).all():
+            raise ValueError("Input X contains NaN or infinity")
+        decision = X @ fast["weights"] + fast["intercepts"]
+        
+        if fast["method"] == "sigmoid":
+            prob_up = (1.0 / (1.0 + np.exp(fast["a"] * decision + fast["b"]))).mean(axis=1)
+        else:
+            prob_up = np.mean(
+                [np.interp(decision[:, i], x_thr, y_thr) for i, (x_thr, y_thr) in enumerate(fast["tables"])],
+                axis=0,
+            )
+        
+        prob_up = np.minimum(prob_up, 1.0)
+        return np.column_stack([1.0 - prob_up, prob_up])
+    
     def save(self, path: str) -> None:
         """Save model to disk."""
         Path(path).parent.mkdir(parents=True, exist_ok=True)
@@ -165,6 +255,8 @@ class ProbModel:
         model.calibrated_model = data["calibrated_model"]
         model.scaler = data["scaler"]
         model.is_fitted = data["is_fitted"]
+        if model.is_fitted:
+            model._build_fast_predictor()
         logger.info(f"Loaded model from {path}")
         return model
 
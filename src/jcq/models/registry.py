@@ -11,6 +11,25 @@ from sqlalchemy import text
 
 logger = logging.getLogger(__name__)
 
+# Statements are built once at import and reused by every call
+_INSERT_RUN = text("""
+    INSERT INTO run_registry (run_id, run_type, started_at, status, meta)
+    VALUES (:run_id, :run_type, :started_at, :status, :meta)
+""")
+
+_UPDATE_RUN_PG = text("""
+    UPDATE run_registry
+    SET status = :status, ended_at = :ended_at,
+        meta = COALESCE(meta, '{}'::jsonb) || :meta::jsonb
+    WHERE run_id = :run_id
+""")
+
+_UPDATE_RUN_SQLITE = text("""
+    UPDATE run_registry
+    SET status = :status, ended_at = :ended_at
+    WHERE run_id = :run_id
+""")
+
 
 def register_model_run(
     run_type: str,
@@ -33,10 +52,7 @@ def register_model_run(
     
     with engine.begin() as conn:
         conn.execute(
-            text("""
-                INSERT INTO run_registry (run_id, run_type, started_at, status, meta)
-                VALUES (:run_id, :run_type, :started_at, :status, :meta)
-            """),
+            _INSERT_RUN,
             {
                 "run_id": run_id,
                 "run_type": run_type,
@@ -63,26 +79,15 @@ def update_run_status(
         update_dict["meta"] = meta
     
     with engine.begin() as conn:
-        if "postgresql" in str(engine.url):
-            from sqlalchemy.dialects.postgresql import json
+        if engine.dialect.name == "postgresql":
             conn.execute(
-                text("""
-                    UPDATE run_registry
-                    SET status = :status, ended_at = :ended_at,
-                        meta = COALESCE(meta, '{}'::jsonb) || :meta::jsonb
-                    WHERE run_id = :run_id
-                """),
+                _UPDATE_RUN_PG,
                 {**update_dict, "run_id": run_id},
             )
         else:
             # SQLite
-            import json as json_lib
             conn.execute(
-                text("""
-                    UPDATE run_registry
-                    SET status = :status, ended_at = :ended_at
-                    WHERE run_id = :run_id
-                """),
+                _UPDATE_RUN_SQLITE,
                 update_dict,
             )
     
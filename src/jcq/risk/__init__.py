@@ -1,10 +1,11 @@
 """Risk management."""
 
-from jcq.risk.contract_specs import get_contract_spec, tick_to_price, price_to_tick
+from jcq.risk.contract_specs import ContractSpec, get_contract_spec, tick_to_price, price_to_tick
 from jcq.risk.risk_manager import RiskManager
 from jcq.risk.limits import RiskLimits
 
 __all__ = [
+    "ContractSpec",
     "get_contract_spec",
     "tick_to_price",
     "price_to_tick",
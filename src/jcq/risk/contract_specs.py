@@ -1,51 +1,66 @@
 """Contract specifications for NQ and MNQ."""
 
-from typing import Dict, Any
+from collections import namedtuple
+from functools import lru_cache
 import logging
 
 logger = logging.getLogger(__name__)
 
+ContractSpec = namedtuple("ContractSpec", ["tick_size", "point_value", "tick_value"])
+
+# Immutable shared specs; get_contract_spec returns these instances directly
 CONTRACT_SPECS = {
-    "NQ": {
-        "tick_size": 0.25,
-        "point_value": 20.0,  # $20 per point
-        "tick_value": 5.0,   # $5 per tick
-    },
-    "MNQ": {
-        "tick_size": 0.25,
-        "point_value": 2.0,   # $2 per point
-        "tick_value": 0.5,   # $0.50 per tick
-    },
+    "NQ": ContractSpec(
+        tick_size=0.25,
+        point_value=20.0,  # $20 per point
+        tick_value=5.0,    # $5 per tick
+    ),
+    "MNQ": ContractSpec(
+        tick_size=0.25,
+        point_value=2.0,   # $2 per point
+        tick_value=0.5,    # $0.50 per tick
+    ),
 }
 
 
-def get_contract_spec(symbol: str) -> Dict[str, Any]:
+def get_contract_spec(symbol: str) -> ContractSpec:
     """Get contract specifications for a symbol."""
-    if symbol not in CONTRACT_SPECS:
+    spec = CONTRACT_SPECS.get(symbol)
+    if spec is None:
         raise ValueError(f"Unknown symbol: {symbol}")
-    return CONTRACT_SPECS[symbol].copy()
+    return spec
+
+
+@lru_cache(maxsize=8)
+def _tick_size(symbol: str) -> float:
+    return get_contract_spec(symbol).tick_size
+
+
+@lru_cache(maxsize=8)
+def _point_value(symbol: str) -> float:
+    return get_contract_spec(symbol).point_value
+
+
+@lru_cache(maxsize=8)
+def _tick_value(symbol: str) -> float:
+    return get_contract_spec(symbol).tick_value
 
 
 def tick_to_price(ticks: float, symbol: str) -> float:
     """Convert ticks to price."""
-    spec = get_contract_spec(symbol)
-    return ticks * spec["tick_size"]
+    return ticks * _tick_size(symbol)
 
 
 def price_to_tick(price: float, symbol: str) -> float:
     """Convert price to ticks."""
-    spec = get_contract_spec(symbol)
-    return price / spec["tick_size"]
+    return price / _tick_size(symbol)
 
 
 def dollars_per_point(symbol: str) -> float:
     """Get dollars per point for a symbol."""
-    spec = get_contract_spec(symbol)
-    return spec["point_value"]
+    return _point_value(symbol)
 
 
 def dollars_per_tick(symbol: str) -> float:
     """Get dollars per tick for a symbol."""
-    spec = get_contract_spec(symbol)
-    return spec["tick_value"]
-
+    return _tick_value(symbol)
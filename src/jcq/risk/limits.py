@@ -1,15 +1,32 @@
 """Risk limits and daily counters."""
 
+from collections import OrderedDict
 from datetime import date
 from typing import Dict, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Past trading days of counters to retain (about one year)
+_MAX_DAYS = 252
+
 
 class RiskLimits:
     """Stateful risk limits tracker."""
     
+    __slots__ = (
+        "cfg",
+        "_daily_realized_r",
+        "_daily_trades",
+        "open_risk_r",
+        "_daily_max_r",
+        "_max_trades",
+        "_max_open",
+        "_hot_date",
+        "_hot_realized",
+        "_hot_trades",
+    )
+    
     def __init__(self, cfg_risk: Dict):
         """
         Initialize risk limits.
@@ -18,32 +35,73 @@ class RiskLimits:
             cfg_risk: Risk configuration dict
         """
         self.cfg = cfg_risk
-        self.daily_realized_r: Dict[date, float] = {}
-        self.daily_trades: Dict[date, int] = {}
+        lim = cfg_risk.get("limits", {})
+        self._daily_max_r = float(lim.get("daily_max_r", 5.0))
+        self._max_trades = int(lim.get("max_trades_day", 10))
+        self._max_open = float(lim.get("max_open_risk_r", 3.0))
+        self._daily_realized_r: "OrderedDict[date, float]" = OrderedDict()
+        self._daily_trades: "OrderedDict[date, int]" = OrderedDict()
         self.open_risk_r: float = 0.0
+        
+        # Counters for the current trading day live in scalars; the dicts
+        # are flushed to when the date changes or when they are read.
+        self._hot_date: Optional[date] = None
+        self._hot_realized: float = 0.0
+        self._hot_trades: int = 0
     
     def reset_daily(self, trade_date: date) -> None:
         """Reset daily counters (call at start of each day)."""
-        if trade_date not in self.daily_realized_r:
-            self.daily_realized_r[trade_date] = 0.0
-        if trade_date not in self.daily_trades:
-            self.daily_trades[trade_date] = 0
+        if trade_date == self._hot_date:
+            return
+        
+        if self._hot_date is not None:
+            self._flush_hot()
+        
+        self._hot_date = trade_date
+        self._hot_realized = self._daily_realized_r.get(trade_date, 0.0)
+        self._hot_trades = self._daily_trades.get(trade_date, 0)
+    
+    @property
+    def daily_realized_r(self) -> Dict[date, float]:
+        """Realized R per trading day, oldest first, including the current day."""
+        if self._hot_date is not None:
+            self._flush_hot()
+        return dict(self._daily_realized_r)
+    
+    @property
+    def daily_trades(self) -> Dict[date, int]:
+        """Trade count per trading day, oldest first, including the current day."""
+        if self._hot_date is not None:
+            self._flush_hot()
+        return dict(self._daily_trades)
+    
+    def _flush_hot(self) -> None:
+        """Store the current day's counters, keeping at most _MAX_DAYS days."""
+        d = self._hot_date
+        for counters, value in (
+            (self._daily_realized_r, self._hot_realized),
+            (self._daily_trades, self._hot_trades),
+        ):
+            counters[d] = value
+            counters.move_to_end(d)
+            if len(counters) > _MAX_DAYS:
+                counters.popitem(last=False)
     
     def add_realized_r(self, trade_date: date, r: float) -> None:
         """Add realized R to daily counter."""
         self.reset_daily(trade_date)
-        self.daily_realized_r[trade_date] += r
+        self._hot_realized += r
     
     def add_trade(self, trade_date: date) -> None:
         """Increment daily trade count."""
         self.reset_daily(trade_date)
-        self.daily_trades[trade_date] += 1
+        self._hot_trades += 1
     
     def check_daily_max_r(self, trade_date: date) -> tuple[bool, Optional[str]]:
         """Check if daily max R limit would be exceeded."""
         self.reset_daily(trade_date)
-        current_r = self.daily_realized_r[trade_date]
-        max_r = self.cfg.get("limits", {}).get("daily_max_r", 5.0)
+        current_r = self._hot_realized
+        max_r = self._daily_max_r
         
         if current_r <= -max_r:
             return False, f"Daily max R limit exceeded: {current_r:.2f} <= -{max_r}"
@@ -52,8 +110,8 @@ class RiskLimits:
     def check_max_trades(self, trade_date: date) -> tuple[bool, Optional[str]]:
         """Check if max trades per day limit would be exceeded."""
         self.reset_daily(trade_date)
-        current_trades = self.daily_trades[trade_date]
-        max_trades = self.cfg.get("limits", {}).get("max_trades_day", 10)
+        current_trades = self._hot_trades
+        max_trades = self._max_trades
         
         if current_trades >= max_trades:
             return False, f"Max trades per day limit exceeded: {current_trades} >= {max_trades}"
@@ -62,7 +120,7 @@ class RiskLimits:
     def check_max_open_risk(self, additional_r: float) -> tuple[bool, Optional[str]]:
         """Check if max open risk R limit would be exceeded."""
         new_open_risk = self.open_risk_r + additional_r
-        max_open = self.cfg.get("limits", {}).get("max_open_risk_r", 3.0)
+        max_open = self._max_open
         
         if new_open_risk > max_open:
             return False, f"Max open risk R limit would be exceeded: {new_open_risk:.2f} > {max_open}"
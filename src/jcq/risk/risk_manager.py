@@ -5,15 +5,27 @@ from datetime import date
 from typing import Dict, Any, Optional
 import logging
 
-from jcq.risk.contract_specs import get_contract_spec, dollars_per_point
+from jcq.risk.contract_specs import get_contract_spec
 from jcq.risk.limits import RiskLimits
 
 logger = logging.getLogger(__name__)
 
+_MNQ_SPEC = get_contract_spec("MNQ")
+
 
 class RiskManager:
     """Risk manager for position sizing and limit checks."""
     
+    __slots__ = (
+        "cfg",
+        "limits",
+        "_dollars_per_r",
+        "_prefer_micro",
+        "_slippage_ticks",
+        "_fees_per_contract",
+        "_round_trip_mult",
+    )
+    
     def __init__(self, cfg_risk: Dict[str, Any]):
         """
         Initialize risk manager.
@@ -23,6 +35,14 @@ class RiskManager:
         """
         self.cfg = cfg_risk
         self.limits = RiskLimits(cfg_risk)
+        
+        sizing = cfg_risk.get("position_sizing", {})
+        costs = cfg_risk.get("costs", {})
+        self._dollars_per_r = float(sizing.get("dollars_per_r", 100.0))
+        self._prefer_micro = bool(sizing.get("prefer_micro", True))
+        self._slippage_ticks = float(costs.get("slippage_ticks_per_side", 0.5))
+        self._fees_per_contract = float(costs.get("fees_per_contract", 0.50))
+        self._round_trip_mult = 2 if costs.get("round_trip_fees", True) else 1
     
     def size_position(
         self,
@@ -63,12 +83,10 @@ class RiskManager:
         
         # Get contract spec
         spec = get_contract_spec(symbol)
-        dollars_per_r = self.cfg.get("position_sizing", {}).get("dollars_per_r", 100.0)
         
         # Calculate position size
-        dollars_at_risk = dollars_per_r * 1.0  # 1R
-        dollars_per_point = spec["point_value"]
-        contracts = math.floor(dollars_at_risk / (risk_points * dollars_per_point))
+        dollars_at_risk = self._dollars_per_r * 1.0  # 1R
+        contracts = math.floor(dollars_at_risk / (risk_points * spec.point_value))
         
         if contracts <= 0:
             return {
@@ -79,17 +97,12 @@ class RiskManager:
                 "costs_estimate": 0.0,
             }
         
-        # Prefer micro if enabled
-        prefer_micro = self.cfg.get("position_sizing", {}).get("prefer_micro", True)
-        if prefer_micro and symbol == "NQ":
-            # Check if MNQ would work
-            mnq_spec = get_contract_spec("MNQ")
-            mnq_contracts = math.floor(dollars_at_risk / (risk_points * mnq_spec["point_value"]))
-            if mnq_contracts >= 1:
-                # Use MNQ instead
-                symbol = "MNQ"
-                spec = mnq_spec
-                contracts = mnq_contracts
+        # Prefer micro if enabled. MNQ is 1/10 of NQ per point, so any size
+        # that allows >= 1 NQ allows >= 10 MNQ and no extra check is needed.
+        if self._prefer_micro and symbol == "NQ":
+            symbol = "MNQ"
+            spec = _MNQ_SPEC
+            contracts = math.floor(dollars_at_risk / (risk_points * spec.point_value))
         
         # Check limits
         risk_r = 1.0  # This trade risks 1R
@@ -128,12 +141,8 @@ class RiskManager:
             }
         
         # Estimate costs
-        slippage_ticks = self.cfg.get("costs", {}).get("slippage_ticks_per_side", 0.5)
-        fees_per_contract = self.cfg.get("costs", {}).get("fees_per_contract", 0.50)
-        round_trip = self.cfg.get("costs", {}).get("round_trip_fees", True)
-        
-        slippage_cost = slippage_ticks * spec["tick_value"] * contracts
-        fees = fees_per_contract * contracts * (2 if round_trip else 1)
+        slippage_cost = self._slippage_ticks * spec.tick_value * contracts
+        fees = self._fees_per_contract * contracts * self._round_trip_mult
         costs_estimate = slippage_cost + fees
         
         return {
@@ -2,16 +2,119 @@
 
 import pandas as pd
 import numpy as np
-from typing import Dict, Any
+from typing import Dict, Any, Tuple, Optional
 import logging
+from joblib import Parallel, cpu_count, delayed
 
 logger = logging.getLogger(__name__)
 
+# Max bootstrap matrix elements held at once by the NumPy fallback
+_MC_CHUNK_ELEMENTS = 1_000_000
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional
+    njit = None
+
+
+if njit is not None:
+    # fastmath without nnan/ninf, so non-finite inputs keep IEEE semantics
+    @njit(parallel=True, fastmath={"nsz", "arcp", "contract", "afn", "reassoc"}, cache=True)
+    def _mc_kernel(r_stream, n_sim, seed):
+        """Stream each bootstrap path, tracking final R and max drawdown in scalars."""
+        n = r_stream.shape[0]
+        final_r = np.empty(n_sim)
+        max_dd = np.empty(n_sim)
+        
+        for s in prange(n_sim):
+            np.random.seed(seed + s)
+            # The peak starts at the first step's equity, as in the cumulative max
+            equity = r_stream[np.random.randint(0, n)]
+            peak = equity
+            dd = 0.0
+            for _ in range(1, n):
+                equity += r_stream[np.random.randint(0, n)]
+                if equity > peak:
+                    peak = equity
+                elif equity - peak < dd:
+                    dd = equity - peak
+            final_r[s] = equity
+            max_dd[s] = dd
+        
+        return final_r, max_dd
+else:
+    _mc_kernel = None
+
+
+def _mc_numpy(
+    r_stream: np.ndarray,
+    n_simulations: int,
+    rng: np.random.Generator,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorized bootstrap in row chunks, reusing preallocated scratch buffers."""
+    n = len(r_stream)
+    final_r_results = np.empty(n_simulations, dtype=np.float64)
+    max_dd_results = np.empty(n_simulations, dtype=np.float64)
+    
+    rows = max(1, min(n_simulations, _MC_CHUNK_ELEMENTS // n))
+    equity_buf = np.empty((rows, n), dtype=np.float64)
+    running_max_buf = np.empty((rows, n), dtype=np.float64)
+    
+    for start in range(0, n_simulations, rows):
+        m = min(rows, n_simulations - start)
+        equity = equity_buf[:m]
+        running_max = running_max_buf[:m]
+        
+        # Bootstrap this chunk of simulations
+        idx = rng.integers(0, n, size=(m, n))
+        np.take(r_stream, idx, out=equity)
+        
+        # Equity curves
+        np.cumsum(equity, axis=1, out=equity)
+        final_r_results[start:start + m] = equity[:, -1]
+        
+        # Max drawdown
+        np.maximum.accumulate(equity, axis=1, out=running_max)
+        np.subtract(equity, running_max, out=running_max)
+        max_dd_results[start:start + m] = running_max.min(axis=1)
+    
+    return final_r_results, max_dd_results
+
+
+def _mc_shard(r_stream: np.ndarray, n_simulations: int, seed: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Run one independent shard of simulations with its own generator."""
+    return _mc_numpy(r_stream, n_simulations, np.random.default_rng(seed))
+
+
+def _mc_parallel(
+    r_stream: np.ndarray,
+    n_simulations: int,
+    rng: np.random.Generator,
+    n_jobs: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Split simulations into per-worker shards and run them with joblib."""
+    n_workers = cpu_count() if n_jobs < 0 else n_jobs
+    n_workers = max(1, min(n_workers, n_simulations))
+    shard_sizes = [len(a) for a in np.array_split(np.arange(n_simulations), n_workers)]
+    shard_seeds = rng.integers(0, 2**63 - 1, size=n_workers)
+    
+    results = Parallel(n_jobs=n_workers, backend="loky")(
+        delayed(_mc_shard)(r_stream, size, int(shard_seed))
+        for size, shard_seed in zip(shard_sizes, shard_seeds)
+    )
+    
+    final_r_results = np.concatenate([r[0] for r in results])
+    max_dd_results = np.concatenate([r[1] for r in results])
+    return final_r_results, max_dd_results
+
 
 def run_monte_carlo(
     df_trades: pd.DataFrame,
     n_simulations: int = 1000,
     confidence_levels: list = [0.95, 0.99],
+    rng: Optional[np.random.Generator] = None,
+    n_jobs: int = 1,
+    seed: Optional[int] = None,
 ) -> Dict[str, Any]:
     """
     Run Monte Carlo simulation on trade R stream.
@@ -20,6 +123,10 @@ def run_monte_carlo(
         df_trades: DataFrame with trades (must have r_mult column)
         n_simulations: Number of simulations
         confidence_levels: Confidence levels for VaR/CVaR
+        rng: Random generator (pass a seeded one for reproducible results)
+        n_jobs: Worker processes for the NumPy path (-1 = all cores); the numba
+            kernel is already multi-threaded and ignores this
+        seed: Seed for a fresh generator when rng is not given
     
     Returns:
         Dict with metrics: final_r_dist, max_dd_dist, var, cvar
@@ -27,45 +134,39 @@ def run_monte_carlo(
     if df_trades.empty or "r_mult" not in df_trades.columns:
         return {}
     
-    r_stream = df_trades["r_mult"].values
-    
-    final_r_results = []
-    max_dd_results = []
+    r_stream = df_trades["r_mult"].to_numpy(dtype=np.float64)
     
-    for _ in range(n_simulations):
-        # Bootstrap sample
-        sample = np.random.choice(r_stream, size=len(r_stream), replace=True)
-        
-        # Equity curve
-        equity = np.cumsum(sample)
-        final_r = equity[-1]
-        final_r_results.append(final_r)
-        
-        # Max drawdown
-        running_max = np.maximum.accumulate(equity)
-        drawdown = equity - running_max
-        max_dd = np.min(drawdown)
-        max_dd_results.append(max_dd)
+    if rng is None:
+        rng = np.random.default_rng(seed)
     
-    final_r_results = np.array(final_r_results)
-    max_dd_results = np.array(max_dd_results)
+    if _mc_kernel is not None:
+        # Derive the kernel's per-simulation seeds from rng so it stays reproducible
+        kernel_seed = int(rng.integers(0, 2**31 - 1))
+        final_r_results, max_dd_results = _mc_kernel(r_stream, n_simulations, kernel_seed)
+    elif n_jobs != 1:
+        final_r_results, max_dd_results = _mc_parallel(r_stream, n_simulations, rng, n_jobs)
+    else:
+        final_r_results, max_dd_results = _mc_numpy(r_stream, n_simulations, rng)
     
-    # VaR and CVaR
+    # VaR and CVaR (one sort covers every confidence level)
     var_results = {}
     cvar_results = {}
+    sorted_r = np.sort(final_r_results)
+    n_sorted = len(sorted_r)
     
     for cl in confidence_levels:
         alpha = 1 - cl
-        var = np.percentile(final_r_results, alpha * 100)
-        cvar = final_r_results[final_r_results <= var].mean()
+        k = min(max(int(alpha * n_sorted), 0), n_sorted - 1)
+        var = sorted_r[k]
+        cvar = sorted_r[:k + 1].mean()
         var_results[f"var_{int(cl*100)}"] = float(var)
         cvar_results[f"cvar_{int(cl*100)}"] = float(cvar)
     
     return {
         "final_r_mean": float(np.mean(final_r_results)),
         "final_r_std": float(np.std(final_r_results)),
-        "final_r_min": float(np.min(final_r_results)),
-        "final_r_max": float(np.max(final_r_results)),
+        "final_r_min": float(sorted_r[0]),
+        "final_r_max": float(sorted_r[-1]),
         "max_dd_mean": float(np.mean(max_dd_results)),
         "max_dd_std": float(np.std(max_dd_results)),
         "max_dd_min": float(np.min(max_dd_results)),
@@ -1,10 +1,12 @@
 """Database operations with SQLAlchemy."""
 
+import json
 import os
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator, Union
+import numpy as np
 import pandas as pd
-from sqlalchemy import create_engine, text, inspect
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.engine import Engine
 from sqlalchemy.exc import SQLAlchemyError
 import logging
@@ -15,8 +17,110 @@ from jcq.storage.schema import Base
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+except ImportError:  # orjson is optional
+    orjson = None
+
+def _has_non_finite(obj: Any) -> bool:
+    """Whether obj contains a NaN or infinite float (at any nesting depth)."""
+    if isinstance(obj, (float, np.floating)):
+        return not np.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_has_non_finite(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_has_non_finite(v) for v in obj)
+    if isinstance(obj, np.ndarray):
+        return obj.dtype.kind in "fc" and not np.isfinite(obj).all()
+    return False
+
+
+def _json_default(obj: Any) -> Any:
+    """Convert numpy values for json.dumps."""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    def _dumps(obj: Any) -> str:
+        out = orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+        if b"null" in out and _has_non_finite(obj):
+            # orjson writes NaN/inf as null; keep json's NaN/Infinity tokens
+            return json.dumps(obj, default=_json_default)
+        return out.decode("utf-8")
+    
+    def _loads(data: Union[str, bytes]) -> Any:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # NaN/Infinity tokens written by json.dumps are not strict JSON
+            return json.loads(data)
+else:
+    _dumps = json.dumps
+    _loads = json.loads
+
+try:
+    import connectorx as cx
+except ImportError:  # connectorx is optional
+    cx = None
+
 _ENGINE: Optional[Engine] = None
 
+# Columns upsert_bars requires, in insert order
+_BAR_COLUMNS = ["timestamp", "open", "high", "low", "close", "volume"]
+
+# Rows per executemany batch (bounds driver-side memory on large backfills)
+_UPSERT_CHUNK_SIZE = 10_000
+
+# Driver-level upsert SQL keyed by dialect, executed with positional tuples
+# (Postgres bars go through the COPY path below instead)
+_BARS_UPSERT_SQL = {
+    "sqlite": """
+        INSERT OR REPLACE INTO market_bars (ts, symbol, timeframe, open, high, low, close, volume)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+}
+
+# Postgres bulk path: COPY into a transaction-scoped staging table, then merge.
+# _seq numbers staged rows in COPY order so the last duplicate key wins, as
+# with the per-row upsert.
+_BARS_STAGE_SQL = (
+    "CREATE TEMP TABLE _stage_bars (LIKE market_bars INCLUDING DEFAULTS, _seq BIGSERIAL) "
+    "ON COMMIT DROP"
+)
+_BARS_COPY_SQL = (
+    "COPY _stage_bars (ts, symbol, timeframe, open, high, low, close, volume) FROM STDIN"
+)
+_BARS_MERGE_SQL = """
+    INSERT INTO market_bars (ts, symbol, timeframe, open, high, low, close, volume)
+    SELECT DISTINCT ON (ts, symbol, timeframe)
+        ts, symbol, timeframe, open, high, low, close, volume
+    FROM _stage_bars
+    ORDER BY ts, symbol, timeframe, _seq DESC
+    ON CONFLICT (ts, symbol, timeframe) DO UPDATE SET
+        open = EXCLUDED.open,
+        high = EXCLUDED.high,
+        low = EXCLUDED.low,
+        close = EXCLUDED.close,
+        volume = EXCLUDED.volume
+"""
+
+_FEATURES_UPSERT_SQL = {
+    "postgresql": """
+        INSERT INTO features_store (ts, symbol, timeframe, features)
+        VALUES (%s, %s, %s, %s)
+        ON CONFLICT (ts, symbol, timeframe) DO UPDATE SET
+            features = EXCLUDED.features
+    """,
+    "sqlite": """
+        INSERT OR REPLACE INTO features_store (ts, symbol, timeframe, features)
+        VALUES (?, ?, ?, ?)
+    """,
+}
+
 
 def get_engine() -> Engine:
     """
@@ -67,6 +171,53 @@ def get_engine() -> Engine:
     return _ENGINE
 
 
+def _executemany_chunked(conn, sql: str, rows: List[tuple]) -> int:
+    """Run a driver-level executemany in fixed-size batches; return rows affected."""
+    count = 0
+    for i in range(0, len(rows), _UPSERT_CHUNK_SIZE):
+        result = conn.exec_driver_sql(sql, rows[i:i + _UPSERT_CHUNK_SIZE])
+        count += max(result.rowcount, 0)
+    return count
+
+
+def _read_sql(engine: Engine, query: str, params: Dict[str, Any], parse_dates: List[str]) -> pd.DataFrame:
+    """
+    Run a read query, using connectorx's native Postgres reader when available.
+    
+    connectorx does not take bind parameters, so they are rendered as quoted
+    literals by the engine's own dialect.
+    """
+    if cx is None or engine.dialect.name != "postgresql":
+        return pd.read_sql(query, engine, params=params, parse_dates=parse_dates)
+    
+    binds = {
+        k: v.to_pydatetime() if isinstance(v, pd.Timestamp) else v
+        for k, v in params.items()
+    }
+    literal_query = str(
+        text(query).bindparams(**binds).compile(
+            dialect=engine.dialect, compile_kwargs={"literal_binds": True}
+        )
+    )
+    conn_str = engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+    table = cx.read_sql(conn_str, literal_query, return_type="arrow")
+    return table.to_pandas()
+
+
+def _copy_upsert_bars(conn, rows: List[tuple]) -> int:
+    """Upsert bars on Postgres via COPY into a staging table; return rows affected."""
+    conn.exec_driver_sql(_BARS_STAGE_SQL)
+    cur = conn.connection.cursor()
+    try:
+        with cur.copy(_BARS_COPY_SQL) as copy:
+            for row in rows:
+                copy.write_row(row)
+    finally:
+        cur.close()
+    result = conn.exec_driver_sql(_BARS_MERGE_SQL)
+    return max(result.rowcount, 0)
+
+
 def ensure_schema() -> None:
     """Create all tables if they don't exist."""
     engine = get_engine()
@@ -91,61 +242,32 @@ def upsert_bars(df: pd.DataFrame, symbol: str, timeframe: str = "1m") -> int:
     
     engine = get_engine()
     
-    # Ensure timestamp is timezone-aware UTC
-    if "timestamp" in df.columns:
-        df = df.copy()
-        if df["timestamp"].dtype == "object" or not hasattr(df["timestamp"].dtype, "tz"):
-            df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True)
-        elif df["timestamp"].dt.tz is None:
-            df["timestamp"] = df["timestamp"].dt.tz_localize("UTC")
-        else:
-            df["timestamp"] = df["timestamp"].dt.tz_convert("UTC")
+    missing = [col for col in _BAR_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"Bars DataFrame missing columns: {missing}")
     
-    # Prepare data
-    records = []
-    for _, row in df.iterrows():
-        records.append({
-            "ts": row["timestamp"],
-            "symbol": symbol,
-            "timeframe": timeframe,
-            "open": float(row["open"]),
-            "high": float(row["high"]),
-            "low": float(row["low"]),
-            "close": float(row["close"]),
-            "volume": float(row["volume"]),
-        })
-    
-    # Batch upsert (Postgres: ON CONFLICT, SQLite: REPLACE)
+    # Ensure timestamp is timezone-aware UTC (normalized on its own, no frame copy)
+    ts = df["timestamp"]
+    if ts.dtype == "object" or not hasattr(ts.dtype, "tz"):
+        ts = pd.to_datetime(ts, utc=True)
+    elif ts.dt.tz is None:
+        ts = ts.dt.tz_localize("UTC")
+    else:
+        ts = ts.dt.tz_convert("UTC")
+    
+    dialect = engine.dialect.name
+    
+    # Prepare data (one float64 cast for all price/volume columns)
+    ts_arr = pd.DatetimeIndex(ts).to_pydatetime()
+    values = df[_BAR_COLUMNS[1:]].to_numpy(dtype=np.float64).tolist()
+    rows = [(t, symbol, timeframe, *vals) for t, vals in zip(ts_arr, values)]
+    
+    # Batched upsert (Postgres: COPY + ON CONFLICT, SQLite: REPLACE)
     def _upsert():
         with engine.begin() as conn:
-            if "postgresql" in str(engine.url):
-                # Postgres upsert
-                from sqlalchemy.dialects.postgresql import insert
-                stmt = insert(Base.metadata.tables["market_bars"]).values(records)
-                stmt = stmt.on_conflict_do_update(
-                    index_elements=["ts", "symbol", "timeframe"],
-                    set_=dict(
-                        open=stmt.excluded.open,
-                        high=stmt.excluded.high,
-                        low=stmt.excluded.low,
-                        close=stmt.excluded.close,
-                        volume=stmt.excluded.volume,
-                    ),
-                )
-                result = conn.execute(stmt)
-            else:
-                # SQLite replace
-                conn.execute(
-                    text("""
-                        INSERT OR REPLACE INTO market_bars 
-                        (ts, symbol, timeframe, open, high, low, close, volume)
-                        VALUES (:ts, :symbol, :timeframe, :open, :high, :low, :close, :volume)
-                    """),
-                    records,
-                )
-                result = conn.execute(text("SELECT changes()"))
-                return result.scalar()
-            return result.rowcount
+            if dialect == "postgresql":
+                return _copy_upsert_bars(conn, rows)
+            return _executemany_chunked(conn, _BARS_UPSERT_SQL[dialect], rows)
     
     try:
         count = retry_with_backoff(_upsert, max_attempts=3)
@@ -161,7 +283,9 @@ def read_bars(
     timeframe: str = "1m",
     start: Optional[pd.Timestamp] = None,
     end: Optional[pd.Timestamp] = None,
-) -> pd.DataFrame:
+    stream: bool = False,
+    chunksize: int = 100_000,
+) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
     """
     Read market bars from database.
     
@@ -170,9 +294,12 @@ def read_bars(
         timeframe: Timeframe (e.g., "1m")
         start: Start timestamp (UTC)
         end: End timestamp (UTC)
+        stream: If True, return an iterator of DataFrames of up to chunksize rows
+        chunksize: Rows per chunk when streaming
     
     Returns:
         DataFrame with columns: timestamp, open, high, low, close, volume
+        (or an iterator of such DataFrames when stream=True)
     """
     engine = get_engine()
     
@@ -193,11 +320,29 @@ def read_bars(
     
     query += " ORDER BY ts"
     
+    if stream:
+        return _stream_bars(engine, query, params, chunksize)
+    
     try:
-        df = pd.read_sql(query, engine, params=params, parse_dates=["timestamp"])
-        if not df.empty and df["timestamp"].dt.tz is None:
-            df["timestamp"] = df["timestamp"].dt.tz_localize("UTC")
-        return df
+        df = _read_sql(engine, query, params, ["timestamp"])
+        return _bars_to_utc(df)
+    except Exception as e:
+        logger.error(f"Failed to read bars: {e}")
+        raise
+
+
+def _bars_to_utc(df: pd.DataFrame) -> pd.DataFrame:
+    """Localize a naive bars timestamp column to UTC."""
+    if not df.empty and df["timestamp"].dt.tz is None:
+        df["timestamp"] = df["timestamp"].dt.tz_localize("UTC")
+    return df
+
+
+def _stream_bars(engine: Engine, query: str, params: Dict[str, Any], chunksize: int) -> Iterator[pd.DataFrame]:
+    """Yield bars in chunks so callers never hold the full range in memory."""
+    try:
+        for chunk in pd.read_sql(query, engine, params=params, parse_dates=["timestamp"], chunksize=chunksize):
+            yield _bars_to_utc(chunk)
     except Exception as e:
         logger.error(f"Failed to read bars: {e}")
         raise
@@ -226,49 +371,27 @@ def upsert_features(
     
     engine = get_engine()
     
+    sql = _FEATURES_UPSERT_SQL[engine.dialect.name]
+    
+    # Normalize the whole index to UTC once instead of per row
+    index = df.index
+    if not isinstance(index, pd.DatetimeIndex):
+        index = pd.DatetimeIndex(index)
+    index = index.tz_localize("UTC") if index.tz is None else index.tz_convert("UTC")
+    ts_arr = index.to_pydatetime()
+    
+    # Serialize the features column in one pass
+    feats = df[features_col]
+    if feats.dtype == object and isinstance(feats.iloc[0], dict):
+        feats = feats.map(_dumps)
+    feats_arr = feats.to_numpy()
+    
     # Prepare data
-    records = []
-    for ts, row in df.iterrows():
-        if isinstance(ts, pd.Timestamp):
-            if ts.tz is None:
-                ts = ts.tz_localize("UTC")
-            else:
-                ts = ts.tz_convert("UTC")
-        
-        features = row[features_col]
-        if isinstance(features, dict):
-            import json
-            features = json.dumps(features)
-        
-        records.append({
-            "ts": ts,
-            "symbol": symbol,
-            "timeframe": timeframe,
-            "features": features,
-        })
+    rows = [(ts, symbol, timeframe, f) for ts, f in zip(ts_arr, feats_arr)]
     
     def _upsert():
         with engine.begin() as conn:
-            if "postgresql" in str(engine.url):
-                from sqlalchemy.dialects.postgresql import insert
-                stmt = insert(Base.metadata.tables["features_store"]).values(records)
-                stmt = stmt.on_conflict_do_update(
-                    index_elements=["ts", "symbol", "timeframe"],
-                    set_=dict(features=stmt.excluded.features),
-                )
-                result = conn.execute(stmt)
-            else:
-                conn.execute(
-                    text("""
-                        INSERT OR REPLACE INTO features_store 
-                        (ts, symbol, timeframe, features)
-                        VALUES (:ts, :symbol, :timeframe, :features)
-                    """),
-                    records,
-                )
-                result = conn.execute(text("SELECT changes()"))
-                return result.scalar()
-            return result.rowcount
+            return _executemany_chunked(conn, sql, rows)
     
     try:
         count = retry_with_backoff(_upsert, max_attempts=3)
@@ -317,12 +440,14 @@ def read_features(
     query += " ORDER BY ts"
     
     try:
-        df = pd.read_sql(query, engine, params=params, parse_dates=["ts"])
+        df = _read_sql(engine, query, params, ["ts"])
         df = df.set_index("ts")
         
         # Parse JSON features
-        import json
-        df["features"] = df["features"].apply(lambda x: json.loads(x) if isinstance(x, str) else x)
+        df["features"] = [
+            _loads(x) if isinstance(x, (str, bytes)) else x
+            for x in df["features"].to_numpy()
+        ]
         
         if df.index.tz is None:
             df.index = df.index.tz_localize("UTC")
@@ -1,25 +1,171 @@
 """Parquet storage for time-series data."""
 
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Optional, List, Tuple, TYPE_CHECKING
 import pandas as pd
-import pyarrow as pa
-import pyarrow.parquet as pq
 import logging
 
 from jcq.core.config import get_config
 
+# pyarrow is imported inside the functions that need it, so importing this
+# module (e.g. only for read_macro or Supabase mirroring) stays cheap.
+if TYPE_CHECKING:
+    import pyarrow as pa
+
 logger = logging.getLogger(__name__)
 
+# Arrow -> pandas conversion that frees each Arrow column as its block is built,
+# so the two copies never coexist in full. NumPy dtypes (and ns timestamps)
+# are kept on purpose: downstream feature/strategy code relies on them.
+_TO_PANDAS_KWARGS = {
+    "self_destruct": True,
+    "split_blocks": True,
+    "use_threads": True,
+    "coerce_temporal_nanoseconds": True,
+}
+
+
+@lru_cache(maxsize=1)
+def _arrow_defaults() -> Tuple["pa.DataType", "pa.fs.FileSystem", "pa.dataset.FragmentScanOptions"]:
+    """
+    Shared Arrow objects, built on first use.
+    
+    Returns:
+        (ts_type, mmap_fs, scan_options): the on-disk timestamp type for bars
+        and features; a local filesystem that memory-maps files so column
+        buffers come from the page cache; and Parquet scan options that
+        coalesce column-chunk reads per row group and overlap them with decoding
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.fs
+    
+    ts_type = pa.timestamp("us", tz="UTC")
+    mmap_fs = pa.fs.LocalFileSystem(use_mmap=True)
+    scan_options = ds.ParquetFragmentScanOptions(
+        pre_buffer=True,
+        buffer_size=1 << 20,
+        use_buffered_stream=False,
+    )
+    return ts_type, mmap_fs, scan_options
+
 
+@lru_cache(maxsize=1)
 def _get_data_dir() -> Path:
-    """Get data directory from config."""
+    """Get data directory from config (cached; cleared by reload_config)."""
     config = get_config()
     data_dir = config.get("app", {}).get("data_dir", "data")
     repo_root = Path(__file__).parent.parent.parent.parent
     return repo_root / data_dir
 
 
+def _write_options(columns) -> dict:
+    """
+    Parquet writer settings shared by all writers.
+    
+    Zstd with column statistics and a page index lets range-filtered reads
+    skip row groups and pages. Timestamps are delta-encoded (they are
+    near-monotonic) instead of dictionary-encoded.
+    """
+    has_ts = "timestamp" in columns
+    return {
+        "compression": "zstd",
+        "compression_level": 3,
+        "use_dictionary": [c for c in columns if c != "timestamp"] if has_ts else True,
+        "column_encoding": {"timestamp": "DELTA_BINARY_PACKED"} if has_ts else None,
+        "write_statistics": True,
+        "write_page_index": True,
+        "data_page_size": 1 << 20,
+    }
+
+
+def _to_arrow_table(df: pd.DataFrame) -> "pa.Table":
+    """
+    Build an Arrow table from df with a UTC timestamp column, without copying df.
+    
+    Timestamps are stored as microseconds, which bars never go below and
+    which delta-encode to fewer bytes than nanoseconds.
+    """
+    import pyarrow as pa
+    
+    ts_type = _arrow_defaults()[0]
+    ts = pd.to_datetime(df["timestamp"], utc=True)
+    other_cols = [c for c in df.columns if c != "timestamp"]
+    table = pa.Table.from_pandas(df, columns=other_cols, preserve_index=False)
+    ts_arr = pa.array(ts.to_numpy(dtype="datetime64[us]"), type=ts_type)
+    return table.add_column(df.columns.get_loc("timestamp"), "timestamp", ts_arr)
+
+
+def _with_date_partition(table: "pa.Table") -> "pa.Table":
+    """Append the ISO "date" partition column, computed in Arrow from timestamp."""
+    import pyarrow.compute as pc
+    
+    return table.append_column("date", pc.strftime(table["timestamp"], format="%Y-%m-%d"))
+
+
+def _to_utc(ts: pd.Timestamp) -> pd.Timestamp:
+    """Normalize a timestamp bound to tz-aware UTC."""
+    ts = pd.Timestamp(ts)
+    return ts.tz_localize("UTC") if ts.tz is None else ts.tz_convert("UTC")
+
+
+def _scan_timestamp_range(
+    base_path: Path,
+    start: Optional[pd.Timestamp],
+    end: Optional[pd.Timestamp],
+    columns: Optional[List[str]],
+) -> "pa.Table":
+    """
+    Read a (possibly date-partitioned) Parquet dataset with pushdown.
+    
+    The timestamp bounds are pushed into the scan, so row-group statistics
+    and date partitions outside the window are skipped, and only the
+    requested columns are decoded. The ``date`` partition column is never
+    returned.
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    
+    ts_type, mmap_fs, scan_options = _arrow_defaults()
+    dataset = ds.dataset(
+        str(base_path),
+        format="parquet",
+        partitioning="hive",
+        filesystem=mmap_fs,
+    )
+    
+    if columns is None:
+        columns = [name for name in dataset.schema.names if name != "date"]
+    elif "timestamp" not in columns:
+        columns = ["timestamp"] + list(columns)
+    
+    # Hive "date" partitions hold ISO dates, so string bounds prune whole directories
+    partitioned = "date" in dataset.schema.names
+    conditions = []
+    if start is not None:
+        start = _to_utc(start)
+        conditions.append(ds.field("timestamp") >= pa.scalar(start, type=ts_type))
+        if partitioned:
+            conditions.append(ds.field("date") >= start.date().isoformat())
+    if end is not None:
+        end = _to_utc(end)
+        conditions.append(ds.field("timestamp") <= pa.scalar(end, type=ts_type))
+        if partitioned:
+            conditions.append(ds.field("date") <= end.date().isoformat())
+    
+    expr = None
+    for cond in conditions:
+        expr = cond if expr is None else expr & cond
+    
+    return dataset.to_table(
+        columns=columns,
+        filter=expr,
+        fragment_scan_options=scan_options,
+        use_threads=True,
+    )
+
+
 def write_bars(
     df: pd.DataFrame,
     symbol: str,
@@ -51,21 +197,20 @@ def write_bars(
     if "timestamp" not in df.columns:
         raise ValueError("DataFrame must have 'timestamp' column or index")
     
-    df = df.copy()
-    df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True)
+    import pyarrow.parquet as pq
+    
+    table = _to_arrow_table(df)
     
     if partition_by_date:
         # Add date partition column
-        df["date"] = df["timestamp"].dt.date.astype(str)
+        table = _with_date_partition(table)
         
         # Write partitioned
-        table = pa.Table.from_pandas(df, preserve_index=False)
         pq.write_to_dataset(
             table,
             base_path,
             partition_cols=["date"],
-            use_dictionary=True,
-            compression="snappy",
+            **_write_options(table.column_names),
         )
         logger.info(f"Wrote {len(df)} bars to {base_path} (partitioned)")
         return str(base_path)
@@ -73,7 +218,7 @@ def write_bars(
         # Write single file
         base_path.mkdir(parents=True, exist_ok=True)
         file_path = base_path / f"{symbol}_{timeframe}.parquet"
-        df.to_parquet(file_path, compression="snappy", index=False)
+        pq.write_table(table, file_path, **_write_options(table.column_names))
         logger.info(f"Wrote {len(df)} bars to {file_path}")
         return str(file_path)
 
@@ -83,6 +228,7 @@ def read_bars(
     timeframe: str = "1m",
     start: Optional[pd.Timestamp] = None,
     end: Optional[pd.Timestamp] = None,
+    columns: Optional[List[str]] = None,
 ) -> pd.DataFrame:
     """
     Read bars from Parquet.
@@ -92,6 +238,7 @@ def read_bars(
         timeframe: Timeframe (e.g., "1m")
         start: Start timestamp (UTC)
         end: End timestamp (UTC)
+        columns: Columns to load besides timestamp (default: all)
     
     Returns:
         DataFrame with timestamp column and ohlcv
@@ -103,23 +250,17 @@ def read_bars(
         logger.warning(f"Path does not exist: {base_path}")
         return pd.DataFrame()
     
-    # Read partitioned dataset
+    # Read partitioned dataset (range filter and projection pushed into the scan)
     try:
-        dataset = pq.ParquetDataset(base_path)
-        df = dataset.read_pandas().to_pandas()
+        table = _scan_timestamp_range(base_path, start, end, columns)
+        df = table.to_pandas(**_TO_PANDAS_KWARGS)
+        del table
         
         if "timestamp" in df.columns:
             df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True)
-            df = df.sort_values("timestamp")
-            
-            if start is not None:
-                df = df[df["timestamp"] >= start]
-            if end is not None:
-                df = df[df["timestamp"] <= end]
-        
-        # Drop partition column if present
-        if "date" in df.columns:
-            df = df.drop(columns=["date"])
+            # Partitions are written in time order, so usually no sort is needed
+            if not df["timestamp"].is_monotonic_increasing:
+                df = df.sort_values("timestamp", kind="mergesort")
         
         logger.debug(f"Read {len(df)} bars from {base_path}")
         return df
@@ -159,25 +300,24 @@ def write_features(
     if "timestamp" not in df.columns:
         raise ValueError("DataFrame must have timestamp index or column")
     
-    df = df.copy()
-    df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True)
+    import pyarrow.parquet as pq
+    
+    table = _to_arrow_table(df)
     
     if partition_by_date:
-        df["date"] = df["timestamp"].dt.date.astype(str)
-        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = _with_date_partition(table)
         pq.write_to_dataset(
             table,
             base_path,
             partition_cols=["date"],
-            use_dictionary=True,
-            compression="snappy",
+            **_write_options(table.column_names),
         )
         logger.info(f"Wrote {len(df)} feature rows to {base_path} (partitioned)")
         return str(base_path)
     else:
         base_path.mkdir(parents=True, exist_ok=True)
         file_path = base_path / f"{symbol}_{timeframe}_features.parquet"
-        df.to_parquet(file_path, compression="snappy", index=False)
+        pq.write_table(table, file_path, **_write_options(table.column_names))
         logger.info(f"Wrote {len(df)} feature rows to {file_path}")
         return str(file_path)
 
@@ -187,6 +327,7 @@ def read_features(
     timeframe: str = "1m",
     start: Optional[pd.Timestamp] = None,
     end: Optional[pd.Timestamp] = None,
+    columns: Optional[List[str]] = None,
 ) -> pd.DataFrame:
     """
     Read features from Parquet.
@@ -196,6 +337,7 @@ def read_features(
         timeframe: Timeframe (e.g., "1m")
         start: Start timestamp (UTC)
         end: End timestamp (UTC)
+        columns: Feature columns to load (default: all)
     
     Returns:
         DataFrame with timestamp index and features
@@ -208,20 +350,15 @@ def read_features(
         return pd.DataFrame()
     
     try:
-        dataset = pq.ParquetDataset(base_path)
-        df = dataset.read_pandas().to_pandas()
+        table = _scan_timestamp_range(base_path, start, end, columns)
+        df = table.to_pandas(**_TO_PANDAS_KWARGS)
+        del table
         
         if "timestamp" in df.columns:
             df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True)
-            df = df.set_index("timestamp").sort_index()
-            
-            if start is not None:
-                df = df[df.index >= start]
-            if end is not None:
-                df = df[df.index <= end]
-        
-        if "date" in df.columns:
-            df = df.drop(columns=["date"])
+            df = df.set_index("timestamp")
+            if not df.index.is_monotonic_increasing:
+                df = df.sort_index(kind="mergesort")
         
         logger.debug(f"Read {len(df)} feature rows from {base_path}")
         return df
@@ -249,7 +386,7 @@ def write_macro(df: pd.DataFrame, series_name: str) -> str:
     base_path.mkdir(parents=True, exist_ok=True)
     
     file_path = base_path / f"{series_name}.parquet"
-    df.to_parquet(file_path, compression="snappy")
+    df.to_parquet(file_path, **_write_options(df.columns))
     logger.info(f"Wrote macro series {series_name} to {file_path}")
     return str(file_path)
 
@@ -272,7 +409,11 @@ def read_macro(series_name: str) -> pd.DataFrame:
         return pd.DataFrame()
     
     try:
-        df = pd.read_parquet(file_path)
+        import pyarrow.parquet as pq
+        
+        table = pq.read_table(str(file_path), memory_map=True)
+        df = table.to_pandas(**_TO_PANDAS_KWARGS)
+        del table
         logger.debug(f"Read macro series {series_name} from {file_path}")
         return df
     except Exception as e:
@@ -60,10 +60,11 @@ def mirror_parquet_to_storage(
     try:
         full_path = f"jcq/{storage_path}"
         
+        # Pass the open file so the client streams it instead of buffering it in memory
         with open(local_path, "rb") as f:
             client.storage.from_(bucket).upload(
                 full_path,
-                f.read(),
+                f,
                 file_options={"content-type": "application/octet-stream"},
             )
         
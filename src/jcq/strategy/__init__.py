@@ -1,8 +1,24 @@
 """Strategy: candidate generation, scoring, and rules."""
 
-from jcq.strategy.candidates import generate_candidates
-from jcq.strategy.scorer import score_candidates, rank_candidates
+from jcq.strategy.candidates import CandidateBatch, generate_candidates, generate_candidates_batch
+from jcq.strategy.scorer import (
+    score_candidates,
+    score_candidates_fast,
+    score_batch,
+    rank_candidates,
+    rank_batch,
+)
 from jcq.strategy.rules import apply_rules
 
-__all__ = ["generate_candidates", "score_candidates", "rank_candidates", "apply_rules"]
+__all__ = [
+    "CandidateBatch",
+    "generate_candidates",
+    "generate_candidates_batch",
+    "score_candidates",
+    "score_candidates_fast",
+    "score_batch",
+    "rank_candidates",
+    "rank_batch",
+    "apply_rules",
+]
 
@@ -1,12 +1,185 @@
 """Candidate generation for trade entries."""
 
+import math
+from dataclasses import dataclass
+from itertools import compress
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional
+    njit = None
+
+# Latest-bar fields read by the candidate rules
+_LATEST_FIELDS = (
+    "close",
+    "session_vwap",
+    "atr_14",
+    "opening_range_high",
+    "opening_range_low",
+    "prior_high",
+    "prior_low",
+)
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _pivot_mask_kernel(values, lookback):
+        """Mark window-max pivots in O(n) with a monotonic deque of indices."""
+        n = values.shape[0]
+        w = 2 * lookback + 1
+        mask = np.zeros(n, dtype=np.bool_)
+        dq = np.empty(n, dtype=np.int64)
+        head = 0
+        tail = 0
+        last_nan = -1
+        
+        for j in range(n):
+            v = values[j]
+            if np.isnan(v):
+                last_nan = j
+            else:
+                while tail > head and values[dq[tail - 1]] <= v:
+                    tail -= 1
+                dq[tail] = j
+                tail += 1
+            while tail > head and dq[head] <= j - w:
+                head += 1
+            
+            # Window [j-w+1, j] is complete and NaN-free: test its center
+            if j >= w - 1 and last_nan <= j - w and tail > head:
+                c = j - lookback
+                if values[c] == values[dq[head]]:
+                    mask[c] = True
+        
+        return mask
+else:
+    _pivot_mask_kernel = None
+
+
+def _pivot_indices(values: np.ndarray, lookback: int, find_high: bool) -> np.ndarray:
+    """
+    Indices whose value is the max (or min) of the centered window around them.
+    
+    Only positions with a full, NaN-free 2*lookback+1 window are considered.
+    """
+    if _pivot_mask_kernel is not None:
+        values = np.asarray(values, dtype=np.float64)
+        return np.flatnonzero(_pivot_mask_kernel(values if find_high else -values, lookback))
+    
+    window = pd.Series(values).rolling(2 * lookback + 1, center=True)
+    extreme = (window.max() if find_high else window.min()).to_numpy()
+    return np.flatnonzero(values == extreme)
+
+
+@dataclass
+class CandidateBatch:
+    """
+    Candidates stored as parallel arrays (one slot per candidate).
+    
+    Scoring and ranking operate on the arrays; records keeps the source
+    candidate dicts so results can be materialized at the API boundary.
+    """
+    entry: np.ndarray
+    stop: np.ndarray
+    target: np.ndarray
+    risk_points: np.ndarray
+    reward_points: np.ndarray
+    side_is_long: np.ndarray
+    tags: List[List[str]]
+    records: List[Dict[str, Any]]
+    prob_up: Optional[float] = None
+    prob_down: Optional[float] = None
+    p_win: Optional[np.ndarray] = None
+    confidence: Optional[np.ndarray] = None
+    R_target: Optional[np.ndarray] = None
+    ev_r: Optional[np.ndarray] = None
+    
+    def __len__(self) -> int:
+        return len(self.records)
+    
+    @property
+    def expected_r(self) -> Optional[np.ndarray]:
+        """Expected return in R units (identical to ev_r)."""
+        return self.ev_r
+    
+    @classmethod
+    def from_dicts(cls, candidates: List[Dict[str, Any]]) -> "CandidateBatch":
+        """Build a batch from candidate dicts as returned by generate_candidates."""
+        n = len(candidates)
+        
+        def floats(key: str) -> np.ndarray:
+            return np.fromiter((c.get(key, np.nan) for c in candidates), dtype=float, count=n)
+        
+        return cls(
+            entry=floats("entry"),
+            stop=floats("stop"),
+            target=floats("target"),
+            risk_points=np.fromiter((c["risk_points"] for c in candidates), dtype=float, count=n),
+            reward_points=np.fromiter((c["reward_points"] for c in candidates), dtype=float, count=n),
+            side_is_long=np.fromiter((c["side"] == "long" for c in candidates), dtype=bool, count=n),
+            tags=[c.get("tags", []) for c in candidates],
+            records=list(candidates),
+        )
+    
+    def take(self, idx: np.ndarray) -> "CandidateBatch":
+        """Select candidates by position or boolean mask, keeping any scored columns."""
+        idx = np.asarray(idx)
+        if idx.dtype == np.bool_:
+            keep = idx.tolist()
+            tags = list(compress(self.tags, keep))
+            records = list(compress(self.records, keep))
+        else:
+            idx = idx.astype(np.intp, copy=False)
+            positions = idx.tolist()
+            tags = [self.tags[i] for i in positions]
+            records = [self.records[i] for i in positions]
+        
+        def pick(values: Optional[np.ndarray]) -> Optional[np.ndarray]:
+            return None if values is None else values[idx]
+        
+        return CandidateBatch(
+            entry=self.entry[idx],
+            stop=self.stop[idx],
+            target=self.target[idx],
+            risk_points=self.risk_points[idx],
+            reward_points=self.reward_points[idx],
+            side_is_long=self.side_is_long[idx],
+            tags=tags,
+            records=records,
+            prob_up=self.prob_up,
+            prob_down=self.prob_down,
+            p_win=pick(self.p_win),
+            confidence=pick(self.confidence),
+            R_target=pick(self.R_target),
+            ev_r=pick(self.ev_r),
+        )
+    
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Write scored columns back into the source dicts and return them."""
+        if self.ev_r is None:
+            return list(self.records)
+        
+        columns = {
+            "confidence": self.confidence.tolist(),
+            "p_win": self.p_win.tolist(),
+            "R_target": self.R_target.tolist(),
+            "ev_r": self.ev_r.tolist(),
+        }
+        for i, record in enumerate(self.records):
+            record["confidence"] = columns["confidence"][i]
+            record["prob_up"] = self.prob_up
+            record["prob_down"] = self.prob_down
+            record["p_win"] = columns["p_win"][i]
+            record["R_target"] = columns["R_target"][i]
+            record["ev_r"] = record["expected_r"] = columns["ev_r"][i]
+        return list(self.records)
+
 
 def generate_candidates(
     df_features: pd.DataFrame,
@@ -23,32 +196,42 @@ def generate_candidates(
     
     Returns:
         List of candidate dicts with: entry, stop, target, risk_points, reward_points, tags, context
+        (VWAP candidates also carry is_vwap=True)
     """
     if df_features.empty:
         return []
     
-    # Get latest bar
-    latest = df_features.iloc[-1]
-    current_price = latest.get("close", latest.get("close", 0))
+    # Latest bar as plain floats (only for columns that exist)
+    columns = df_features.columns
+    latest = {
+        k: float(df_features[k].iat[-1])
+        for k in _LATEST_FIELDS
+        if k in columns
+    }
+    current_price = latest.get("close", 0.0)
     
     if current_price == 0:
         return []
     
     candidates = []
     cfg_candidates = cfg_strategy.get("candidates", {})
+    min_rr = cfg_candidates.get("min_rr", 1.5)
+    max_rr = cfg_candidates.get("max_rr", 5.0)
     
     # VWAP-based candidates
-    if cfg_candidates.get("vwap", {}).get("enabled", True):
-        if "session_vwap" in latest and "atr_14" in latest and pd.notna(latest["session_vwap"]):
+    vwap_cfg = cfg_candidates.get("vwap", {})
+    if vwap_cfg.get("enabled", True):
+        if "session_vwap" in latest and "atr_14" in latest and not math.isnan(latest["session_vwap"]):
             vwap = latest["session_vwap"]
             atr = latest["atr_14"]
+            atr_half = atr * 0.5
             
-            multipliers = cfg_candidates.get("vwap", {}).get("atr_multipliers", [0.5, 1.0, 1.5, 2.0])
+            multipliers = vwap_cfg.get("atr_multipliers", [0.5, 1.0, 1.5, 2.0])
             
             for k in multipliers:
                 # Long: price near VWAP - k*ATR
                 entry_long = vwap - k * atr
-                stop_long = entry_long - atr * 0.5
+                stop_long = entry_long - atr_half
                 target_long = entry_long + atr * (k + 1.0)
                 
                 if stop_long < current_price < target_long:
@@ -56,7 +239,7 @@ def generate_candidates(
                     reward_points = abs(target_long - entry_long)
                     rr = reward_points / risk_points if risk_points > 0 else 0
                     
-                    if cfg_strategy.get("candidates", {}).get("min_rr", 1.5) <= rr <= cfg_strategy.get("candidates", {}).get("max_rr", 5.0):
+                    if min_rr <= rr <= max_rr:
                         candidates.append({
                             "entry": entry_long,
                             "stop": stop_long,
@@ -65,12 +248,13 @@ def generate_candidates(
                             "reward_points": reward_points,
                             "side": "long",
                             "tags": ["vwap", f"vwap-{k}atr"],
+                            "is_vwap": True,
                             "context": {"vwap": vwap, "atr": atr, "k": k},
                         })
                 
                 # Short: price near VWAP + k*ATR
                 entry_short = vwap + k * atr
-                stop_short = entry_short + atr * 0.5
+                stop_short = entry_short + atr_half
                 target_short = entry_short - atr * (k + 1.0)
                 
                 if target_short < current_price < stop_short:
@@ -78,7 +262,7 @@ def generate_candidates(
                     reward_points = abs(entry_short - target_short)
                     rr = reward_points / risk_points if risk_points > 0 else 0
                     
-                    if cfg_strategy.get("candidates", {}).get("min_rr", 1.5) <= rr <= cfg_strategy.get("candidates", {}).get("max_rr", 5.0):
+                    if min_rr <= rr <= max_rr:
                         candidates.append({
                             "entry": entry_short,
                             "stop": stop_short,
@@ -87,17 +271,19 @@ def generate_candidates(
                             "reward_points": reward_points,
                             "side": "short",
                             "tags": ["vwap", f"vwap+{k}atr"],
+                            "is_vwap": True,
                             "context": {"vwap": vwap, "atr": atr, "k": k},
                         })
     
     # Opening range retests
-    if cfg_candidates.get("opening_range", {}).get("enabled", True):
+    or_cfg = cfg_candidates.get("opening_range", {})
+    if or_cfg.get("enabled", True):
         if "opening_range_high" in latest and "opening_range_low" in latest:
             orh = latest["opening_range_high"]
             orl = latest["opening_range_low"]
-            tolerance = cfg_candidates.get("opening_range", {}).get("tolerance_ticks", 2) * 0.25  # Convert to price
+            tolerance = or_cfg.get("tolerance_ticks", 2) * 0.25  # Convert to price
             
-            if pd.notna(orh) and pd.notna(orl):
+            if not (math.isnan(orh) or math.isnan(orl)):
                 # Long: retest of ORL
                 if abs(current_price - orl) <= tolerance:
                     stop = orl - atr * 0.5 if "atr_14" in latest else orl - (orh - orl) * 0.5
@@ -106,7 +292,7 @@ def generate_candidates(
                     reward_points = abs(target - orl)
                     rr = reward_points / risk_points if risk_points > 0 else 0
                     
-                    if rr >= cfg_strategy.get("candidates", {}).get("min_rr", 1.5):
+                    if rr >= min_rr:
                         candidates.append({
                             "entry": orl,
                             "stop": stop,
@@ -126,7 +312,7 @@ def generate_candidates(
                     reward_points = abs(orh - target)
                     rr = reward_points / risk_points if risk_points > 0 else 0
                     
-                    if rr >= cfg_strategy.get("candidates", {}).get("min_rr", 1.5):
+                    if rr >= min_rr:
                         candidates.append({
                             "entry": orh,
                             "stop": stop,
@@ -139,24 +325,26 @@ def generate_candidates(
                         })
     
     # Prior session levels
-    if cfg_candidates.get("prior_session", {}).get("enabled", True):
+    prior_cfg = cfg_candidates.get("prior_session", {})
+    if prior_cfg.get("enabled", True):
         if "prior_high" in latest and "prior_low" in latest:
             ph = latest["prior_high"]
             pl = latest["prior_low"]
-            tolerance = cfg_candidates.get("prior_session", {}).get("tolerance_ticks", 2) * 0.25
+            tolerance = prior_cfg.get("tolerance_ticks", 2) * 0.25
             
-            if pd.notna(ph) and pd.notna(pl):
+            if not (math.isnan(ph) or math.isnan(pl)):
                 atr = latest.get("atr_14", (ph - pl) * 0.1)
+                atr_half = atr * 0.5
                 
                 # Long: retest of prior low
                 if abs(current_price - pl) <= tolerance:
-                    stop = pl - atr * 0.5
+                    stop = pl - atr_half
                     target = ph
                     risk_points = abs(pl - stop)
                     reward_points = abs(target - pl)
                     rr = reward_points / risk_points if risk_points > 0 else 0
                     
-                    if rr >= cfg_strategy.get("candidates", {}).get("min_rr", 1.5):
+                    if rr >= min_rr:
                         candidates.append({
                             "entry": pl,
                             "stop": stop,
@@ -170,13 +358,13 @@ def generate_candidates(
                 
                 # Short: retest of prior high
                 if abs(current_price - ph) <= tolerance:
-                    stop = ph + atr * 0.5
+                    stop = ph + atr_half
                     target = pl
                     risk_points = abs(ph - stop)
                     reward_points = abs(ph - target)
                     rr = reward_points / risk_points if risk_points > 0 else 0
                     
-                    if rr >= cfg_strategy.get("candidates", {}).get("min_rr", 1.5):
+                    if rr >= min_rr:
                         candidates.append({
                             "entry": ph,
                             "stop": stop,
@@ -189,62 +377,209 @@ def generate_candidates(
                         })
     
     # Simple swing high/low (pivot-based)
-    if cfg_candidates.get("swing", {}).get("enabled", True):
-        lookback = cfg_candidates.get("swing", {}).get("pivot_lookback", 5)
-        min_swing_atr = cfg_candidates.get("swing", {}).get("min_swing_size_atr", 1.0)
+    swing_cfg = cfg_candidates.get("swing", {})
+    if swing_cfg.get("enabled", True):
+        lookback = swing_cfg.get("pivot_lookback", 5)
+        min_swing_atr = swing_cfg.get("min_swing_size_atr", 1.0)
+        max_per_side = swing_cfg.get("max_per_side", 1)
         
         if len(df_features) > lookback * 2 and "atr_14" in latest:
             atr = latest["atr_14"]
-            recent = df_features.iloc[-lookback*2:]
+            atr_half = atr * 0.5
+            # A pivot needs a full 2*lookback+1 window; scan 2*lookback+1 centers
+            recent = df_features.iloc[-(lookback * 4 + 1):]
+            highs = recent["high"].to_numpy()
+            lows = recent["low"].to_numpy()
             
-            # Find swing high
-            for i in range(lookback, len(recent) - lookback):
-                if recent.iloc[i]["high"] == recent.iloc[i-lookback:i+lookback+1]["high"].max():
-                    swing_high = recent.iloc[i]["high"]
-                    if swing_high - current_price >= min_swing_atr * atr:
-                        # Short candidate
-                        stop = swing_high + atr * 0.5
-                        target = current_price - (swing_high - current_price) * 1.5
-                        risk_points = abs(swing_high - stop)
-                        reward_points = abs(swing_high - target)
-                        rr = reward_points / risk_points if risk_points > 0 else 0
-                        
-                        if rr >= cfg_strategy.get("candidates", {}).get("min_rr", 1.5):
-                            candidates.append({
-                                "entry": swing_high,
-                                "stop": stop,
-                                "target": target,
-                                "risk_points": risk_points,
-                                "reward_points": reward_points,
-                                "side": "short",
-                                "tags": ["swing", "swing_high"],
-                                "context": {"swing_high": swing_high},
-                            })
+            # Find swing high (most recent pivots first)
+            n_short = 0
+            for i in _pivot_indices(highs, lookback, find_high=True)[::-1]:
+                if n_short >= max_per_side:
+                    break
+                swing_high = highs[i]
+                if swing_high - current_price >= min_swing_atr * atr:
+                    # Short candidate
+                    stop = swing_high + atr_half
+                    target = current_price - (swing_high - current_price) * 1.5
+                    risk_points = abs(swing_high - stop)
+                    reward_points = abs(swing_high - target)
+                    rr = reward_points / risk_points if risk_points > 0 else 0
+                    
+                    if rr >= min_rr:
+                        candidates.append({
+                            "entry": swing_high,
+                            "stop": stop,
+                            "target": target,
+                            "risk_points": risk_points,
+                            "reward_points": reward_points,
+                            "side": "short",
+                            "tags": ["swing", "swing_high"],
+                            "context": {"swing_high": swing_high},
+                        })
+                        n_short += 1
             
-            # Find swing low
-            for i in range(lookback, len(recent) - lookback):
-                if recent.iloc[i]["low"] == recent.iloc[i-lookback:i+lookback+1]["low"].min():
-                    swing_low = recent.iloc[i]["low"]
-                    if current_price - swing_low >= min_swing_atr * atr:
-                        # Long candidate
-                        stop = swing_low - atr * 0.5
-                        target = current_price + (current_price - swing_low) * 1.5
-                        risk_points = abs(swing_low - stop)
-                        reward_points = abs(target - swing_low)
-                        rr = reward_points / risk_points if risk_points > 0 else 0
-                        
-                        if rr >= cfg_strategy.get("candidates", {}).get("min_rr", 1.5):
-                            candidates.append({
-                                "entry": swing_low,
-                                "stop": stop,
-                                "target": target,
-                                "risk_points": risk_points,
-                                "reward_points": reward_points,
-                                "side": "long",
-                                "tags": ["swing", "swing_low"],
-                                "context": {"swing_low": swing_low},
-                            })
+            # Find swing low (most recent pivots first)
+            n_long = 0
+            for i in _pivot_indices(lows, lookback, find_high=False)[::-1]:
+                if n_long >= max_per_side:
+                    break
+                swing_low = lows[i]
+                if current_price - swing_low >= min_swing_atr * atr:
+                    # Long candidate
+                    stop = swing_low - atr_half
+                    target = current_price + (current_price - swing_low) * 1.5
+                    risk_points = abs(swing_low - stop)
+                    reward_points = abs(target - swing_low)
+                    rr = reward_points / risk_points if risk_points > 0 else 0
+                    
+                    if rr >= min_rr:
+                        candidates.append({
+                            "entry": swing_low,
+                            "stop": stop,
+                            "target": target,
+                            "risk_points": risk_points,
+                            "reward_points": reward_points,
+                            "side": "long",
+                            "tags": ["swing", "swing_low"],
+                            "context": {"swing_low": swing_low},
+                        })
+                        n_long += 1
     
     logger.debug(f"Generated {len(candidates)} candidates")
     return candidates
 
+
+def _batch_rows(
+    mask: np.ndarray,
+    entry: np.ndarray,
+    stop: np.ndarray,
+    target: np.ndarray,
+    side: str,
+    rule: str,
+    tags: np.ndarray,
+) -> pd.DataFrame:
+    """Collect the (n_variants, n_bars) cells selected by mask into a frame."""
+    var_idx, bar_idx = np.nonzero(mask)
+    entry = entry[var_idx, bar_idx]
+    stop = stop[var_idx, bar_idx]
+    target = target[var_idx, bar_idx]
+    return pd.DataFrame({
+        "bar": bar_idx,
+        "entry": entry,
+        "stop": stop,
+        "target": target,
+        "risk_points": np.abs(entry - stop),
+        "reward_points": np.abs(target - entry),
+        "side": side,
+        "rule": rule,
+        "tag": tags[var_idx],
+    })
+
+
+def _rr(entry: np.ndarray, stop: np.ndarray, target: np.ndarray) -> np.ndarray:
+    """Reward:risk per cell (0 where risk is zero)."""
+    risk = np.abs(entry - stop)
+    reward = np.abs(target - entry)
+    return np.divide(reward, risk, out=np.zeros_like(reward), where=risk > 0)
+
+
+def generate_candidates_batch(
+    df_features: pd.DataFrame,
+    cfg_strategy: Dict[str, Any],
+) -> pd.DataFrame:
+    """
+    Generate VWAP, opening-range and prior-session candidates for every bar at once.
+    
+    Vectorized counterpart of generate_candidates for backtests: each rule is
+    evaluated as array arithmetic over whole feature columns instead of once
+    per bar. The swing rule (pivots in a trailing window per bar) is not
+    implemented here, so with swing enabled this returns fewer candidates than
+    generate_candidates. BacktestEngine therefore still generates candidates
+    per bar; this function is a library entry point for research and batch
+    backtests that disable the swing rule.
+    
+    Args:
+        df_features: DataFrame with features (one row per bar)
+        cfg_strategy: Strategy configuration
+    
+    Returns:
+        DataFrame with one row per candidate, indexed by the bar's index label,
+        with columns: bar (position), entry, stop, target, risk_points,
+        reward_points, side, rule, tag
+    """
+    columns = df_features.columns
+    if df_features.empty or "close" not in columns:
+        return pd.DataFrame()
+    
+    def col(name: str) -> np.ndarray:
+        return df_features[name].to_numpy(dtype=np.float64)[None, :]
+    
+    close = col("close")
+    has_atr = "atr_14" in columns
+    atr = col("atr_14") if has_atr else None
+    active = close != 0
+    
+    cfg_candidates = cfg_strategy.get("candidates", {})
+    min_rr = cfg_candidates.get("min_rr", 1.5)
+    max_rr = cfg_candidates.get("max_rr", 5.0)
+    frames = []
+    
+    # VWAP-based candidates: multipliers broadcast over a (n_k, 1) axis
+    vwap_cfg = cfg_candidates.get("vwap", {})
+    if vwap_cfg.get("enabled", True) and "session_vwap" in columns and has_atr:
+        vwap = col("session_vwap")
+        multipliers = vwap_cfg.get("atr_multipliers", [0.5, 1.0, 1.5, 2.0])
+        k = np.asarray(multipliers, dtype=np.float64)[:, None]
+        ok = active & ~np.isnan(vwap)
+        
+        entry = vwap - k * atr
+        stop = entry - atr * 0.5
+        target = entry + atr * (k + 1.0)
+        rr = _rr(entry, stop, target)
+        mask = ok & (stop < close) & (close < target) & (min_rr <= rr) & (rr <= max_rr)
+        tags = np.array([f"vwap-{m}atr" for m in multipliers], dtype=object)
+        frames.append(_batch_rows(mask, entry, stop, target, "long", "vwap", tags))
+        
+        entry = vwap + k * atr
+        stop = entry + atr * 0.5
+        target = entry - atr * (k + 1.0)
+        rr = _rr(entry, stop, target)
+        mask = ok & (target < close) & (close < stop) & (min_rr <= rr) & (rr <= max_rr)
+        tags = np.array([f"vwap+{m}atr" for m in multipliers], dtype=object)
+        frames.append(_batch_rows(mask, entry, stop, target, "short", "vwap", tags))
+    
+    # Level retests: (rule, cfg key, low column, high column, long tag, short tag)
+    level_rules = [
+        ("opening_range", "opening_range_low", "opening_range_high", "orl_retest", "orh_retest"),
+        ("prior_session", "prior_low", "prior_high", "prior_low", "prior_high"),
+    ]
+    for rule, low_col, high_col, long_tag, short_tag in level_rules:
+        rule_cfg = cfg_candidates.get(rule, {})
+        if not rule_cfg.get("enabled", True) or low_col not in columns or high_col not in columns:
+            continue
+        
+        lo = col(low_col)
+        hi = col(high_col)
+        tolerance = rule_cfg.get("tolerance_ticks", 2) * 0.25
+        ok = active & ~(np.isnan(lo) | np.isnan(hi))
+        if has_atr:
+            half = atr * 0.5
+        elif rule == "opening_range":
+            half = (hi - lo) * 0.5
+        else:
+            half = (hi - lo) * 0.1 * 0.5
+        
+        stop = lo - half
+        mask = ok & (np.abs(close - lo) <= tolerance) & (_rr(lo, stop, hi) >= min_rr)
+        frames.append(_batch_rows(mask, lo, stop, hi, "long", rule, np.array([long_tag], dtype=object)))
+        
+        stop = hi + half
+        mask = ok & (np.abs(close - hi) <= tolerance) & (_rr(hi, stop, lo) >= min_rr)
+        frames.append(_batch_rows(mask, hi, stop, lo, "short", rule, np.array([short_tag], dtype=object)))
+    
+    if not frames:
+        return pd.DataFrame()
+    
+    out = pd.concat(frames, ignore_index=True).sort_values("bar", kind="stable")
+    out.index = df_features.index[out["bar"].to_numpy()]
+    return out
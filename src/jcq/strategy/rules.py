@@ -1,14 +1,34 @@
 """Rule-based filtering of candidates."""
 
-from typing import List, Dict, Any
+from datetime import time as dt_time
+from functools import lru_cache
+from itertools import compress
+from typing import List, Dict, Any, Tuple
+import numpy as np
 import pandas as pd
 import logging
 
-from jcq.core.time import is_rth
+from jcq.core.time import is_rth, minutes_since_rth_open
 from jcq.core.config import get_config
 
 logger = logging.getLogger(__name__)
 
+# Rejection reason templates; the config value is filled in only when logged
+_REASON_FIRST_MINUTES = "Within first {} minutes of RTH"
+_REASON_LAST_MINUTES = "Within last {} minutes of RTH"
+_REASON_OUTSIDE_WINDOWS = "Outside configured trade windows"
+_REASON_ATR_LOW = "ATR below {}th percentile"
+_REASON_ATR_HIGH = "ATR above {}th percentile"
+_REASON_MR_IN_TREND = "Mean reversion disabled in trend regime"
+
+
+@lru_cache(maxsize=16)
+def _parse_trade_windows(
+    windows: Tuple[Tuple[str, str], ...],
+) -> Tuple[Tuple[dt_time, dt_time], ...]:
+    """Parse (start, end) "HH:MM" strings into time objects once per config."""
+    return tuple((dt_time.fromisoformat(start), dt_time.fromisoformat(end)) for start, end in windows)
+
 
 def apply_rules(
     candidates: List[Dict[str, Any]],
@@ -33,83 +53,95 @@ def apply_rules(
     if not candidates:
         return []
     
-    filtered = []
+    # Bind every rule setting once at the call boundary
     cfg_rules = cfg_strategy.get("rules", {})
+    time_filters = cfg_rules.get("time_filters", {})
+    avoid_first = time_filters.get("avoid_first_minutes", 5)
+    avoid_last = time_filters.get("avoid_last_minutes", 5)
+    trade_windows = cfg_market.get("sessions", {}).get("trade_windows", [])
+    disable_mr_in_trend = cfg_rules.get("regime", {}).get("disable_mean_reversion_in_trend", True)
+    volatility = cfg_rules.get("volatility", {})
+    min_atr_pct = volatility.get("min_atr_percentile", 10)
+    max_atr_pct = volatility.get("max_atr_percentile", 90)
+    blackouts_enabled = cfg_rules.get("blackouts", {}).get("enabled", False)
     
-    for candidate in candidates:
-        rejected = False
-        reason = None
-        
-        # Time-based filters
-        time_filters = cfg_rules.get("time_filters", {})
-        avoid_first = time_filters.get("avoid_first_minutes", 5)
-        avoid_last = time_filters.get("avoid_last_minutes", 5)
-        
-        if is_rth(current_timestamp):
-            from jcq.core.time import minutes_since_rth_open
-            minutes = minutes_since_rth_open(current_timestamp)
-            if minutes is not None:
-                if minutes < avoid_first:
-                    rejected = True
-                    reason = f"Within first {avoid_first} minutes of RTH"
-                elif minutes > (16 * 60 - avoid_last):  # 16:00 - avoid_last
-                    rejected = True
-                    reason = f"Within last {avoid_last} minutes of RTH"
-        
-        # Trade windows
-        trade_windows = cfg_market.get("sessions", {}).get("trade_windows", [])
-        if trade_windows:
-            in_window = False
-            current_et = current_timestamp.tz_convert("America/New_York")
-            current_time = current_et.time()
-            
-            for window in trade_windows:
-                from datetime import time as dt_time
-                start_time = dt_time.fromisoformat(window["start"])
-                end_time = dt_time.fromisoformat(window["end"])
-                
-                if start_time <= current_time <= end_time:
-                    in_window = True
-                    break
-            
-            if not in_window:
-                rejected = True
-                reason = "Outside configured trade windows"
-        
-        # Regime constraints
-        if cfg_rules.get("regime", {}).get("disable_mean_reversion_in_trend", True):
-            if "regime" in df_features.columns:
-                latest_regime = df_features.iloc[-1].get("regime", "")
-                if "trend" in latest_regime and "vwap" in candidate.get("tags", []):
-                    rejected = True
-                    reason = "Mean reversion disabled in trend regime"
-        
-        # Volatility gates
-        volatility = cfg_rules.get("volatility", {})
-        if "atr_14" in df_features.columns:
-            atr = df_features.iloc[-1]["atr_14"]
-            atr_percentile = df_features["atr_14"].rolling(100, min_periods=10).quantile(0.5)
-            
-            min_atr_pct = volatility.get("min_atr_percentile", 10)
-            max_atr_pct = volatility.get("max_atr_percentile", 90)
-            
-            # Simplified check (would need proper percentile calculation)
-            if atr < atr_percentile.iloc[-1] * (min_atr_pct / 50):
-                rejected = True
-                reason = f"ATR below {min_atr_pct}th percentile"
-            elif atr > atr_percentile.iloc[-1] * (max_atr_pct / 50):
-                rejected = True
-                reason = f"ATR above {max_atr_pct}th percentile"
-        
-        # News blackouts (placeholder)
-        if cfg_rules.get("blackouts", {}).get("enabled", False):
-            # TODO: Implement schedule-based blackouts
-            pass
-        
-        if not rejected:
-            filtered.append(candidate)
+    # Latest-bar values read by the rules, taken once as scalars
+    columns = df_features.columns
+    last_vals = {c: df_features[c].values[-1] for c in ("regime", "atr_14", "atr_14_med100") if c in columns}
+    
+    # Time, window, volatility and blackout gates depend only on the
+    # timestamp and the latest features, so evaluate them once per call.
+    reason = None
+    
+    # Time-based filters
+    if is_rth(current_timestamp):
+        minutes = minutes_since_rth_open(current_timestamp)
+        if minutes is not None:
+            if minutes < avoid_first:
+                reason = (_REASON_FIRST_MINUTES, avoid_first)
+            elif minutes > (16 * 60 - avoid_last):  # 16:00 - avoid_last
+                reason = (_REASON_LAST_MINUTES, avoid_last)
+    
+    # Trade windows
+    if trade_windows:
+        parsed_windows = _parse_trade_windows(
+            tuple((window["start"], window["end"]) for window in trade_windows)
+        )
+        current_time = current_timestamp.tz_convert("America/New_York").time()
+        if not any(start <= current_time <= end for start, end in parsed_windows):
+            reason = (_REASON_OUTSIDE_WINDOWS, None)
+    
+    # Volatility gates. add_rule_columns precomputes the 100-bar rolling median;
+    # for frames without it, the last value is the median of the trailing
+    # window (NaN until 10 valid observations).
+    if "atr_14" in last_vals:
+        atr_last = last_vals["atr_14"]
+        if "atr_14_med100" in last_vals:
+            atr_med = last_vals["atr_14_med100"]
         else:
-            logger.debug(f"Rejected candidate {candidate.get('tags', [])}: {reason}")
+            atr_window = df_features["atr_14"].to_numpy(dtype=float)[-100:]
+            atr_window = atr_window[~np.isnan(atr_window)]
+            atr_med = np.median(atr_window) if len(atr_window) >= 10 else np.nan
+        
+        # Simplified check (would need proper percentile calculation)
+        if atr_last < atr_med * (min_atr_pct / 50):
+            reason = (_REASON_ATR_LOW, min_atr_pct)
+        elif atr_last > atr_med * (max_atr_pct / 50):
+            reason = (_REASON_ATR_HIGH, max_atr_pct)
+    
+    # News blackouts (placeholder)
+    if blackouts_enabled:
+        # TODO: Implement schedule-based blackouts
+        pass
+    
+    debug = logger.isEnabledFor(logging.DEBUG)
+    
+    if reason is not None:
+        if debug:
+            template, value = reason
+            logger.debug(f"Rejected all {len(candidates)} candidates: {template.format(value)}")
+        logger.info(f"Filtered {len(candidates)} candidates to 0 after rules")
+        return []
+    
+    # Regime constraints are the only per-candidate rule
+    regime_is_trend = False
+    if disable_mr_in_trend:
+        if "regime" in last_vals:
+            regime_is_trend = "trend" in last_vals["regime"]
+    
+    if regime_is_trend:
+        # generate_candidates flags VWAP candidates; fall back to tags for others
+        accept = [
+            not (candidate["is_vwap"] if "is_vwap" in candidate else "vwap" in candidate.get("tags", []))
+            for candidate in candidates
+        ]
+        if debug:
+            for candidate, ok in zip(candidates, accept):
+                if not ok:
+                    logger.debug(f"Rejected candidate {candidate.get('tags', [])}: {_REASON_MR_IN_TREND}")
+        filtered = list(compress(candidates, accept))
+    else:
+        filtered = list(candidates)
     
     logger.info(f"Filtered {len(candidates)} candidates to {len(filtered)} after rules")
     return filtered
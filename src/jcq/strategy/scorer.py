@@ -7,9 +7,41 @@ import logging
 
 from jcq.models.prob_model import ProbModel
 from jcq.models.bayes import BayesianAdjustment
+from jcq.features.features import RULE_ONLY_COLUMNS
+from jcq.strategy.candidates import CandidateBatch
 
 logger = logging.getLogger(__name__)
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional
+    njit = None
+
+# Below this many candidates the kernel call costs more than the NumPy path
+_EV_KERNEL_MIN_CANDIDATES = 8
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _ev_kernel(p_up, p_down, sides_long, risk, reward, min_prob, max_prob):
+        """Fused P(win) selection, EV computation and threshold filter."""
+        n = risk.shape[0]
+        mask = np.empty(n, dtype=np.bool_)
+        p_win = np.empty(n)
+        R = np.zeros(n)
+        ev = np.empty(n)
+        for i in range(n):
+            p = p_up if sides_long[i] else p_down
+            valid = not (risk[i] <= 0)
+            if valid:
+                R[i] = reward[i] / risk[i]
+            p_win[i] = p
+            ev[i] = p * R[i] - (1.0 - p)
+            mask[i] = valid and p >= min_prob and p <= max_prob
+        return mask, p_win, R, ev
+else:
+    _ev_kernel = None
+
 
 def score_candidates(
     candidates: List[Dict[str, Any]],
@@ -34,70 +66,201 @@ def score_candidates(
     if not candidates or df_features.empty:
         return []
     
-    # Get latest features
-    latest_features = df_features.iloc[-1:].drop(columns=["label"], errors="ignore")
+    # Get latest features, as a raw row in the model's fitted column order when known
+    feature_order = model.feature_names_in_
+    if feature_order is not None and all(c in df_features.columns for c in feature_order):
+        latest_features = np.array(
+            [df_features[c].values[-1] for c in feature_order], dtype=np.float64
+        ).reshape(1, -1)
+    else:
+        latest_features = df_features.iloc[-1:].drop(
+            columns=["label", *RULE_ONLY_COLUMNS], errors="ignore"
+        )
+    
+    # Predict probabilities; BacktestEngine and LiveLoop validate the model and
+    # feature columns up front, so errors here propagate to the caller
+    proba = model.predict_proba(latest_features)
+    prob_down = proba[0, 0]
+    prob_up = proba[0, 1]
     
-    # Predict probabilities
-    try:
-        proba = model.predict_proba(latest_features)
-        prob_down = proba[0, 0]
-        prob_up = proba[0, 1]
-    except Exception as e:
-        logger.error(f"Failed to predict probabilities: {e}")
+    return _score_with_probs(candidates, prob_up, prob_down, cfg_strategy, bayesian_adjuster)
+
+
+def model_feature_index(cols: Dict[str, int], model: ProbModel) -> np.ndarray:
+    """
+    Positions in a feature row of the model's inputs, in fitted column order.
+    
+    Args:
+        cols: Mapping of feature column name to position in row
+        model: Fitted ProbModel
+    
+    Returns:
+        Integer index array selecting the model's features from a row
+    
+    Raises:
+        ValueError: If a column the model was fitted on is not in cols
+    """
+    feature_order = model.feature_names_in_
+    if feature_order is None:
+        # Fitted on raw arrays: fall back to every non-label, non-rule column in row order
+        skip = {"label", *RULE_ONLY_COLUMNS}
+        return np.array([idx for name, idx in cols.items() if name not in skip], dtype=np.intp)
+    
+    missing = [c for c in feature_order if c not in cols]
+    if missing:
+        raise ValueError(f"Features are missing columns the model was fitted on: {missing}")
+    return np.array([cols[c] for c in feature_order], dtype=np.intp)
+
+
+def score_candidates_fast(
+    candidates: List[Dict[str, Any]],
+    row: np.ndarray,
+    cols: Dict[str, int],
+    model: ProbModel,
+    cfg_strategy: Dict[str, Any],
+    bayesian_adjuster: Optional[BayesianAdjustment] = None,
+    feature_idx: Optional[np.ndarray] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Score candidates from a raw feature row instead of a DataFrame.
+    
+    Args:
+        candidates: List of candidate dicts
+        row: Latest feature row as a 1-D array
+        cols: Mapping of feature column name to position in row
+        model: Fitted ProbModel
+        cfg_strategy: Strategy configuration
+        bayesian_adjuster: Optional Bayesian adjustment
+        feature_idx: Precomputed model_feature_index(cols, model); built here if omitted
+    
+    Returns:
+        List of scored candidates with prob_up, prob_down, ev_r, expected_r
+    """
+    if not candidates or row is None or len(row) == 0:
         return []
     
-    scored = []
+    if feature_idx is None:
+        feature_idx = model_feature_index(cols, model)
     
-    for candidate in candidates:
-        side = candidate["side"]
-        risk_points = candidate["risk_points"]
-        reward_points = candidate["reward_points"]
-        
-        if risk_points <= 0:
-            continue
+    proba = model.predict_proba(row[feature_idx].reshape(1, -1))
+    prob_down = proba[0, 0]
+    prob_up = proba[0, 1]
+    
+    return _score_with_probs(candidates, prob_up, prob_down, cfg_strategy, bayesian_adjuster)
+
+
+def _score_with_probs(
+    candidates: List[Dict[str, Any]],
+    prob_up: float,
+    prob_down: float,
+    cfg_strategy: Dict[str, Any],
+    bayesian_adjuster: Optional[BayesianAdjustment],
+) -> List[Dict[str, Any]]:
+    """Attach P(win) and EV to candidate dicts given the model's probabilities."""
+    batch = CandidateBatch.from_dicts(candidates)
+    return score_batch(batch, prob_up, prob_down, cfg_strategy, bayesian_adjuster).to_dicts()
+
+
+def score_batch(
+    batch: CandidateBatch,
+    prob_up: float,
+    prob_down: float,
+    cfg_strategy: Dict[str, Any],
+    bayesian_adjuster: Optional[BayesianAdjustment] = None,
+) -> CandidateBatch:
+    """
+    Score a candidate batch by expected value given the model's probabilities.
+    
+    Args:
+        batch: Candidates as parallel arrays
+        prob_up: Model probability of an up move
+        prob_down: Model probability of a down move
+        cfg_strategy: Strategy configuration
+        bayesian_adjuster: Optional Bayesian adjustment
+    
+    Returns:
+        Batch of candidates passing the risk and probability checks, with
+        p_win, confidence, R_target, ev_r and expected_r populated
+    """
+    cfg_scoring = cfg_strategy.get("scoring", {})
+    use_bayes = cfg_scoring.get("use_bayesian_adjustment", False)
+    min_prob = cfg_scoring.get("min_prob", 0.45)
+    max_prob = cfg_scoring.get("max_prob", 0.95)
+    n = len(batch)
+    risk = batch.risk_points
+    
+    # Bayesian adjustment is elementwise, so adjust the two side probabilities
+    p_up_adj, p_down_adj = prob_up, prob_down
+    if bayesian_adjuster and use_bayes:
+        adjusted, confidence = bayesian_adjuster.adjust_array(np.array([prob_up, prob_down]))
+        p_up_adj, p_down_adj = adjusted[0], adjusted[1]
+    else:
+        confidence = 1.0
+    
+    if _ev_kernel is not None and n >= _EV_KERNEL_MIN_CANDIDATES:
+        accept, p_win, R_target, ev_r = _ev_kernel(
+            float(p_up_adj), float(p_down_adj), batch.side_is_long, risk,
+            batch.reward_points, float(min_prob), float(max_prob),
+        )
+    else:
+        valid = ~(risk <= 0)
         
         # Get P(win) based on side
-        if side == "long":
-            p_win = prob_up
-        else:
-            p_win = prob_down
-        
-        # Apply Bayesian adjustment if enabled
-        if bayesian_adjuster and cfg_strategy.get("scoring", {}).get("use_bayesian_adjustment", False):
-            p_win, confidence = bayesian_adjuster.adjust(p_win)
-            candidate["confidence"] = confidence
-        else:
-            candidate["confidence"] = 1.0
+        p_win = np.where(batch.side_is_long, p_up_adj, p_down_adj)
         
         # Check min/max prob thresholds
-        min_prob = cfg_strategy.get("scoring", {}).get("min_prob", 0.45)
-        max_prob = cfg_strategy.get("scoring", {}).get("max_prob", 0.95)
-        
-        if p_win < min_prob or p_win > max_prob:
-            continue
+        accept = valid & (p_win >= min_prob) & (p_win <= max_prob)
         
         # Compute R ratios
-        R_target = reward_points / risk_points
-        
-        # Expected value in R: P(win) * R_target - (1 - P(win)) * 1.0
-        ev_r = p_win * R_target - (1 - p_win) * 1.0
-        
-        # Expected R (expected return in R units)
-        expected_r = p_win * R_target - (1 - p_win) * 1.0
-        
-        candidate["prob_up"] = prob_up
-        candidate["prob_down"] = prob_down
-        candidate["p_win"] = p_win
-        candidate["R_target"] = R_target
-        candidate["ev_r"] = ev_r
-        candidate["expected_r"] = expected_r
+        R_target = np.divide(batch.reward_points, risk, out=np.zeros(n), where=valid)
         
-        scored.append(candidate)
+        # Expected value in R (also reported as expected_r): P(win) * R_target - (1 - P(win)) * 1.0
+        ev_r = p_win * R_target - (1.0 - p_win)
+    
+    batch.prob_up = prob_up
+    batch.prob_down = prob_down
+    batch.p_win = p_win
+    batch.confidence = np.full(n, confidence)
+    batch.R_target = R_target
+    batch.ev_r = ev_r
+    scored = batch.take(accept)
     
     logger.debug(f"Scored {len(scored)} candidates")
     return scored
 
 
+def rank_batch(batch: CandidateBatch, top_k: int = 5) -> CandidateBatch:
+    """
+    Rank a scored batch by EV_R, then prob, then confidence.
+    
+    Args:
+        batch: Scored candidate batch
+        top_k: Number of top candidates to return
+    
+    Returns:
+        Batch of the top candidates in rank order
+    """
+    return batch.take(_rank_order(batch.ev_r, batch.p_win, batch.confidence, top_k))
+
+
+def _rank_order(
+    ev_r: np.ndarray,
+    p_win: np.ndarray,
+    confidence: np.ndarray,
+    top_k: int,
+) -> np.ndarray:
+    """Positions of the top_k by EV_R desc, then p_win desc, then confidence desc (stable)."""
+    n = len(ev_r)
+    if 0 < top_k < n:
+        # O(N) selection of the k-th best EV, keeping every tie so the
+        # stable tie-break below still sees all contenders
+        kth = -np.partition(-ev_r, top_k - 1)[top_k - 1]
+        pool = np.flatnonzero(ev_r >= kth)
+        order = np.lexsort((-confidence[pool], -p_win[pool], -ev_r[pool]))
+        return pool[order[:top_k]]
+    return np.lexsort((-confidence, -p_win, -ev_r))[:top_k]
+
+
 def rank_candidates(
     candidates: List[Dict[str, Any]],
     top_k: int = 5,
@@ -116,11 +279,12 @@ def rank_candidates(
         return []
     
     # Sort by: EV_R desc, then p_win desc, then confidence desc
-    ranked = sorted(
-        candidates,
-        key=lambda c: (c.get("ev_r", -999), c.get("p_win", 0), c.get("confidence", 0)),
-        reverse=True,
+    n = len(candidates)
+    order = _rank_order(
+        np.fromiter((c.get("ev_r", -999) for c in candidates), dtype=float, count=n),
+        np.fromiter((c.get("p_win", 0) for c in candidates), dtype=float, count=n),
+        np.fromiter((c.get("confidence", 0) for c in candidates), dtype=float, count=n),
+        top_k,
     )
     
-    return ranked[:top_k]
-
+    return [candidates[i] for i in order.tolist()]
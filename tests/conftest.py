@@ -10,30 +10,61 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 
-@pytest.fixture
-def sample_bars():
-    """Sample bars DataFrame for testing."""
+@pytest.fixture(scope="session")
+def _sample_bars_session():
+    """Sample bars built once per test session."""
     dates = pd.date_range("2024-01-01", periods=100, freq="1min", tz="UTC")
-    np.random.seed(42)
-    prices = 15000 + np.cumsum(np.random.randn(100) * 10)
+    rng = np.random.default_rng(42)
+    noise = rng.standard_normal((4, 100))
+    prices = 15000 + np.cumsum(noise[0] * 10)
     
     return pd.DataFrame({
         "timestamp": dates,
-        "open": prices + np.random.randn(100) * 2,
-        "high": prices + np.abs(np.random.randn(100) * 5),
-        "low": prices - np.abs(np.random.randn(100) * 5),
+        "open": prices + noise[1] * 2,
+        "high": prices + np.abs(noise[2] * 5),
+        "low": prices - np.abs(noise[3] * 5),
         "close": prices,
-        "volume": np.random.randint(1000, 10000, 100),
+        "volume": rng.integers(1000, 10000, 100),
     })
 
 
-@pytest.fixture
-def sample_features(sample_bars):
-    """Sample features DataFrame."""
+@pytest.fixture(scope="session")
+def _sample_features_session(_sample_bars_session):
+    """Sample features built once per test session."""
     from jcq.features.features import build_features
     from jcq.core.config import get_config
     
     config = get_config()
     cfg_market = config.get("market", {})
-    return build_features(sample_bars, cfg_market)
+    return build_features(_sample_bars_session, cfg_market)
+
+
+@pytest.fixture
+def sample_bars(_sample_bars_session):
+    """Sample bars DataFrame for testing (a fresh copy per test)."""
+    return _sample_bars_session.copy()
+
+
+@pytest.fixture
+def sample_features(_sample_features_session):
+    """Sample features DataFrame (a fresh copy per test)."""
+    return _sample_features_session.copy()
+
 
+@pytest.fixture(scope="session")
+def fitted_model(_sample_features_session):
+    """Logistic ProbModel fitted once on the sample features."""
+    from jcq.models.prob_model import ProbModel
+    from jcq.core.config import get_config
+    
+    cfg_model = get_config().get("model", {})
+    model = ProbModel(model_type="logistic", config=cfg_model.get("model", {}))
+    
+    feature_cols = [c for c in _sample_features_session.columns if c not in ["label"]]
+    X = _sample_features_session[feature_cols].iloc[:50]
+    y = pd.Series([0, 1] * 25, index=X.index)
+    
+    if len(X) > 0:
+        model.fit(X, y)
+    
+    return model
@@ -1,8 +1,9 @@
 """Tests for candidate generation."""
 
 import pytest
+import numpy as np
 import pandas as pd
-from jcq.strategy.candidates import generate_candidates
+from jcq.strategy.candidates import generate_candidates, generate_candidates_batch
 from jcq.core.config import get_config
 
 
@@ -26,3 +27,135 @@ def test_generate_candidates(sample_features):
         assert "reward_points" in candidate
         assert "side" in candidate
 
+
+
+def _synthetic_features(n: int = 80, seed: int = 2) -> pd.DataFrame:
+    """Feature frame with the columns the candidate rules read (no build_features)."""
+    rng = np.random.default_rng(seed)
+    close = 20000 + np.cumsum(rng.normal(0, 5, n))
+    df = pd.DataFrame({
+        "close": close,
+        "high": close + 2,
+        "low": close - 2,
+        "session_vwap": close + rng.normal(0, 10, n),
+        "atr_14": rng.uniform(3, 10, n),
+        "opening_range_high": close + rng.uniform(-3, 3, n) * 2,
+        "opening_range_low": close - rng.uniform(-3, 3, n) * 2,
+        "prior_high": close + rng.uniform(-1, 1, n),
+        "prior_low": close - rng.uniform(-1, 1, n),
+    }, index=pd.date_range("2024-01-02 14:30", periods=n, freq="1min", tz="UTC"))
+    df.loc[df.index[rng.integers(0, n, 5)], "opening_range_high"] = np.nan
+    return df
+
+
+def test_generate_candidates_batch_matches_per_bar():
+    """Batch generation reproduces per-bar candidates (swing rule excluded)."""
+    config = get_config()
+    cfg_strategy = dict(config.get("strategy", {}))
+    cfg_strategy["candidates"] = {**cfg_strategy.get("candidates", {}), "swing": {"enabled": False}}
+    cfg_market = config.get("market", {})
+    
+    df_features = _synthetic_features()
+    batch = generate_candidates_batch(df_features, cfg_strategy)
+    
+    def key(side, entry, stop, target, tag):
+        return (side, round(float(entry), 6), round(float(stop), 6), round(float(target), 6), tag)
+    
+    total = 0
+    for i in range(len(df_features)):
+        per_bar = generate_candidates(df_features.iloc[:i + 1], cfg_strategy, cfg_market)
+        rows = batch[batch["bar"] == i] if not batch.empty else batch
+        expected = sorted(key(c["side"], c["entry"], c["stop"], c["target"], c["tags"][-1]) for c in per_bar)
+        actual = sorted(key(r.side, r.entry, r.stop, r.target, r.tag) for r in rows.itertuples())
+        assert actual == expected
+        assert (rows.index == df_features.index[i]).all()
+        total += len(expected)
+    
+    assert total > 0
+
+
+def _swing_frame(n: int = 30) -> pd.DataFrame:
+    """Flat bars with one swing high and one swing low inside the scan window."""
+    close = np.full(n, 100.0)
+    high = close + 0.5
+    low = close - 0.5
+    high[n - 8] = 110.0
+    low[n - 10] = 90.0
+    return pd.DataFrame({"close": close, "high": high, "low": low, "atr_14": 2.0})
+
+
+def test_generate_candidates_emits_swing_candidates():
+    """Swing pivots inside the recent window produce one candidate per side."""
+    cfg_strategy = {"candidates": {
+        "vwap": {"enabled": False},
+        "opening_range": {"enabled": False},
+        "prior_levels": {"enabled": False},
+        "swing": {"enabled": True, "pivot_lookback": 5, "min_swing_size_atr": 1.0},
+    }}
+    
+    candidates = generate_candidates(_swing_frame(), cfg_strategy, {})
+    by_side = {c["side"]: c for c in candidates}
+    
+    assert sorted(by_side) == ["long", "short"]
+    assert by_side["short"]["entry"] == 110.0
+    assert by_side["short"]["tags"] == ["swing", "swing_high"]
+    assert by_side["long"]["entry"] == 90.0
+    assert by_side["long"]["stop"] == pytest.approx(89.0)
+
+
+def test_pivot_kernel_matches_rolling_fallback(monkeypatch):
+    """The numba pivot kernel agrees with the centered rolling fallback, NaNs and ties included."""
+    from jcq.strategy import candidates as cand
+    
+    if cand._pivot_mask_kernel is None:
+        pytest.skip("numba not installed")
+    
+    rng = np.random.default_rng(0)
+    arrays = []
+    for _ in range(300):
+        n = int(rng.integers(1, 60))
+        values = rng.integers(0, 8, n).astype(float)  # small range forces ties
+        values[rng.random(n) < 0.1] = np.nan
+        arrays.append((values, int(rng.integers(1, 6))))
+    
+    kernel = [(cand._pivot_indices(v, lb, True), cand._pivot_indices(v, lb, False)) for v, lb in arrays]
+    monkeypatch.setattr(cand, "_pivot_mask_kernel", None)
+    
+    for (values, lookback), (highs, lows) in zip(arrays, kernel):
+        np.testing.assert_array_equal(highs, cand._pivot_indices(values, lookback, True))
+        np.testing.assert_array_equal(lows, cand._pivot_indices(values, lookback, False))
+
+
+def test_generate_candidates_caps_swing_pivots_per_side():
+    """max_per_side keeps the most recent qualifying pivots first."""
+    df = _swing_frame()
+    df.loc[len(df) - 14, "high"] = 112.0
+    cfg_strategy = {"candidates": {
+        "vwap": {"enabled": False},
+        "opening_range": {"enabled": False},
+        "prior_levels": {"enabled": False},
+        "swing": {"enabled": True, "pivot_lookback": 5, "max_per_side": 2},
+    }}
+    
+    shorts = [c["entry"] for c in generate_candidates(df, cfg_strategy, {}) if c["side"] == "short"]
+    
+    assert shorts == [110.0, 112.0]
+    
+    cfg_strategy["candidates"]["swing"]["max_per_side"] = 1
+    shorts = [c["entry"] for c in generate_candidates(df, cfg_strategy, {}) if c["side"] == "short"]
+    
+    assert shorts == [110.0]
+
+
+def test_generate_candidates_batch_omits_swing():
+    """The batch path has no swing rule, so it misses pivots generate_candidates finds."""
+    cfg_strategy = {"candidates": {
+        "vwap": {"enabled": False},
+        "opening_range": {"enabled": False},
+        "prior_levels": {"enabled": False},
+        "swing": {"enabled": True, "pivot_lookback": 5},
+    }}
+    df = _swing_frame()
+    
+    assert generate_candidates(df, cfg_strategy, {})
+    assert generate_candidates_batch(df, cfg_strategy).empty
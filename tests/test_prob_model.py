@@ -0,0 +1,46 @@
+"""Tests for probabilistic model."""
+
+import pytest
+import numpy as np
+import pandas as pd
+from jcq.models.prob_model import ProbModel
+
+
+@pytest.mark.parametrize("method", ["isotonic", "sigmoid"])
+def test_fast_predict_matches_calibrated_model(method):
+    """Collapsed ensemble should match CalibratedClassifierCV predictions."""
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(300, 4)) * [1.0, 2.0, 5.0, 50.0], columns=["a", "b", "c", "d"])
+    y = pd.Series((X["a"] + rng.normal(size=300) > 0).astype(int))
+    
+    model = ProbModel(model_type="logistic", config={"calibration": {"method": method}})
+    model.fit(X, y)
+    
+    proba = model.predict_proba(X.iloc[:20])
+    expected = model.calibrated_model.predict_proba(model.scaler.transform(X.iloc[:20]))
+    
+    assert model._fast is not None
+    assert np.allclose(proba, expected)
+
+
+def test_fast_predict_aligns_columns_by_name():
+    """Reordered columns are aligned by name; missing columns and NaN raise."""
+    rng = np.random.default_rng(1)
+    X = pd.DataFrame(rng.normal(size=(300, 4)) * [1.0, 2.0, 5.0, 50.0], columns=["a", "b", "c", "d"])
+    y = pd.Series((X["a"] - X["d"] / 50 + rng.normal(size=300) > 0).astype(int))
+    
+    model = ProbModel(model_type="logistic", config={"calibration": {"method": "sigmoid"}})
+    model.fit(X, y)
+    assert model._fast is not None
+    
+    expected = model.predict_proba(X.iloc[:20])
+    reordered = X.iloc[:20][["d", "c", "b", "a"]]
+    assert np.allclose(model.predict_proba(reordered), expected)
+    
+    with pytest.raises(ValueError, match="missing feature columns"):
+        model.predict_proba(X.iloc[:20][["a", "b", "c"]])
+    
+    with_nan = X.iloc[:20].copy()
+    with_nan.iloc[0, 0] = np.nan
+    with pytest.raises(ValueError):
+        model.predict_proba(with_nan)
@@ -4,19 +4,20 @@ import pytest
 from datetime import date
 from jcq.risk.contract_specs import get_contract_spec, dollars_per_point
 from jcq.risk.risk_manager import RiskManager
+from jcq.risk.limits import RiskLimits
 from jcq.core.config import get_config
 
 
 def test_contract_specs():
     """Test contract specifications."""
     nq_spec = get_contract_spec("NQ")
-    assert nq_spec["tick_size"] == 0.25
-    assert nq_spec["point_value"] == 20.0
-    assert nq_spec["tick_value"] == 5.0
+    assert nq_spec.tick_size == 0.25
+    assert nq_spec.point_value == 20.0
+    assert nq_spec.tick_value == 5.0
     
     mnq_spec = get_contract_spec("MNQ")
-    assert mnq_spec["point_value"] == 2.0
-    assert mnq_spec["tick_value"] == 0.5
+    assert mnq_spec.point_value == 2.0
+    assert mnq_spec.tick_value == 0.5
 
 
 def test_risk_manager_sizing():
@@ -38,3 +39,18 @@ def test_risk_manager_sizing():
     assert "qty" in decision
     assert decision["qty"] > 0
 
+
+def test_daily_counters_include_current_day():
+    """Reading the daily counters reflects the day still being traded."""
+    limits = RiskLimits({})
+    day1, day2 = date(2024, 1, 2), date(2024, 1, 3)
+    
+    limits.add_trade(day1)
+    limits.add_realized_r(day1, -1.0)
+    assert limits.daily_trades == {day1: 1}
+    assert limits.daily_realized_r == {day1: -1.0}
+    
+    limits.add_trade(day1)
+    limits.add_realized_r(day2, 2.0)
+    assert limits.daily_trades == {day1: 2, day2: 0}
+    assert limits.daily_realized_r == {day1: -1.0, day2: 2.0}
@@ -1,28 +1,24 @@
 """Tests for EV scoring."""
 
 import pytest
+import numpy as np
 import pandas as pd
-from jcq.strategy.scorer import score_candidates, rank_candidates
+from jcq.strategy.candidates import CandidateBatch
 from jcq.models.prob_model import ProbModel
+from jcq.strategy.scorer import (
+    score_candidates,
+    score_candidates_fast,
+    rank_candidates,
+    score_batch,
+    rank_batch,
+)
 from jcq.core.config import get_config
 
 
-def test_score_candidates(sample_features):
+def test_score_candidates(sample_features, fitted_model):
     """Test candidate scoring."""
     config = get_config()
     cfg_strategy = config.get("strategy", {})
-    cfg_model = config.get("model", {})
-    
-    # Create dummy model
-    model = ProbModel(model_type="logistic", config=cfg_model.get("model", {}))
-    
-    # Fit on sample data (simplified)
-    feature_cols = [c for c in sample_features.columns if c not in ["label"]]
-    X = sample_features[feature_cols].iloc[:50]
-    y = pd.Series([0, 1] * 25, index=X.index)
-    
-    if len(X) > 0:
-        model.fit(X, y)
     
     candidates = [{
         "entry": 15000.0,
@@ -34,7 +30,7 @@ def test_score_candidates(sample_features):
         "tags": ["test"],
     }]
     
-    scored = score_candidates(candidates, sample_features, model, cfg_strategy)
+    scored = score_candidates(candidates, sample_features, fitted_model, cfg_strategy)
     
     if scored:
         candidate = scored[0]
@@ -55,3 +51,43 @@ def test_rank_candidates():
     assert len(ranked) == 2
     assert ranked[0]["ev_r"] >= ranked[1]["ev_r"]
 
+
+
+def test_score_and_rank_batch():
+    """Test batch scoring and ranking on parallel arrays."""
+    candidates = [
+        {"risk_points": 5.0, "reward_points": 10.0, "side": "long", "tags": ["a"]},
+        {"risk_points": 4.0, "reward_points": 12.0, "side": "short", "tags": ["b"]},
+        {"risk_points": 0.0, "reward_points": 8.0, "side": "long", "tags": ["c"]},
+        {"risk_points": 2.0, "reward_points": 5.0, "side": "long", "tags": ["d"]},
+    ]
+    cfg_strategy = {"scoring": {"min_prob": 0.4, "max_prob": 0.95}}
+    
+    scored = score_batch(CandidateBatch.from_dicts(candidates), 0.6, 0.4, cfg_strategy)
+    assert scored.tags == [["a"], ["b"], ["d"]]
+    
+    ranked = rank_batch(scored, top_k=2).to_dicts()
+    assert [c["tags"] for c in ranked] == [["d"], ["a"]]
+    assert ranked[0]["ev_r"] == pytest.approx(1.1)
+
+
+def test_score_candidates_fast_uses_fitted_column_order():
+    """Raw-row scoring selects features by name, not by position."""
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(200, 3)), columns=["a", "b", "c"])
+    y = pd.Series((X["a"] - X["c"] > 0).astype(int))
+    model = ProbModel(model_type="logistic", config={"calibration": {"method": "sigmoid"}})
+    model.fit(X, y)
+    
+    # Extra and reordered columns, as in a live feature frame
+    frame = X.assign(triple_barrier_label=1)[["triple_barrier_label", "c", "a", "b"]]
+    cols = {c: i for i, c in enumerate(frame.columns)}
+    candidate = {"risk_points": 1.0, "reward_points": 2.0, "side": "long"}
+    cfg_strategy = {"scoring": {"min_prob": 0.0, "max_prob": 1.0}}
+    
+    scored = score_candidates_fast([dict(candidate)], frame.to_numpy()[-1], cols, model, cfg_strategy)
+    expected = model.predict_proba(X.iloc[-1:])[0, 1]
+    assert scored[0]["prob_up"] == pytest.approx(expected)
+    
+    with pytest.raises(ValueError, match="missing columns"):
+        score_candidates_fast([dict(candidate)], frame.to_numpy()[-1, :3], {"c": 1, "a": 2}, model, cfg_strategy)